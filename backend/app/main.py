@@ -1,13 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
-from app.routes import resume, image, export
+from app.routes import resume, image, export, metrics
+from app.services.gemini_client import init_gemini_client, close_gemini_client
+from app.services.http_session import init_http_session, close_http_session
+from app.services.export_jobs import export_jobs
+from app.services.image_pool import image_pool
+from app.services.render_engine import render_engine
 from app.utils.logger import app_logger
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared upstream clients live for the whole process
+    try:
+        init_gemini_client()
+    except Exception as e:
+        # Keep serving; Gemini-backed routes will report the error per request
+        app_logger.error(f"Error initialising Gemini client: {str(e)}")
+    init_http_session()
+    image_pool.start()
+    render_engine.start()
+    export_jobs.start()
+    try:
+        yield
+    finally:
+        await export_jobs.shutdown()
+        await render_engine.shutdown()
+        image_pool.shutdown()
+        await close_http_session()
+        await close_gemini_client()
+
 app = FastAPI(
     title="Resume Generator API",
-    description="API for generating and formatting resumes using LLM"
+    description="API for generating and formatting resumes using LLM",
+    lifespan=lifespan
 )
 
 # CORS setup for frontend
@@ -23,6 +52,7 @@ app.add_middleware(
 app.include_router(resume.router, prefix="/api/resume", tags=["Resume"])
 app.include_router(image.router, prefix="/api/image", tags=["Image"])
 app.include_router(export.router, prefix="/api/export", tags=["Export"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
 
 # Serve static files if running in production mode (not in development)
 static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -35,5 +65,15 @@ async def root():
     return {"message": "Resume Generator API is running"}
 
 if __name__ == "__main__":
+    import multiprocessing
+    import sys
+    # In the PyInstaller bundle, spawned render workers re-run this entry point;
+    # freeze_support() turns them into workers instead of starting another server
+    multiprocessing.freeze_support()
+
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if getattr(sys, "frozen", False):
+        # The bundle cannot re-import itself by module path, so serve the app object without reload
+        uvicorn.run(app, host="0.0.0.0", port=8000)
+    else:
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
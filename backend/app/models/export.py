@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from enum import Enum
+from typing import List, Optional
 
 
 class ExportFormat(str, Enum):
@@ -10,7 +11,42 @@ class ExportFormat(str, Enum):
     HTML = "html"
 
 
+# Media types for each export format
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.PDF: "application/pdf",
+    ExportFormat.DOCX: "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ExportFormat.PPTX: "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ExportFormat.MD: "text/markdown; charset=utf-8",
+    ExportFormat.HTML: "text/html; charset=utf-8",
+}
+
+
+class RenderOptions(BaseModel):
+    image_dpi: int = Field(150, ge=72, le=600, description="Print resolution embedded images are downsampled to")
+    jpeg_quality: int = Field(85, ge=10, le=95, description="JPEG quality for recompressed images")
+    optimize_images: bool = Field(True, description="Downsample and recompress images before rendering")
+
+
 class ExportRequest(BaseModel):
     html_content: str = Field(..., description="Resume content in HTML format")
     format: ExportFormat = Field(..., description="Desired export format")
-    filename: str = Field("resume", description="Name for the exported file (without extension)")
\ No newline at end of file
+    filename: str = Field("resume", description="Name for the exported file (without extension)")
+    options: RenderOptions = Field(default_factory=RenderOptions, description="PDF/DOCX/PPTX image options")
+
+
+class ExportBundleRequest(BaseModel):
+    html_content: str = Field(..., description="Resume content in HTML format")
+    formats: List[ExportFormat] = Field(..., min_length=1, description="Export formats to include in the zip")
+    filename: str = Field("resume", description="Name for the exported files and the zip (without extension)")
+    options: RenderOptions = Field(default_factory=RenderOptions, description="PDF/DOCX/PPTX image options")
+
+
+class ExportJobStatus(BaseModel):
+    job_id: str = Field(..., description="Identifier of the export job")
+    status: str = Field(..., description="queued, running, done or failed")
+    format: ExportFormat = Field(..., description="Export format")
+    filename: str = Field(..., description="Name for the exported file (without extension)")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    started_at: Optional[float] = Field(None, description="Time a worker picked the job up")
+    finished_at: Optional[float] = Field(None, description="Time the job finished")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
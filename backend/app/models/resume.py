@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from enum import Enum
 from typing import Dict, Any, Optional
 
 
@@ -39,20 +40,48 @@ class ResumeInput(ResumeBase):
 class ResumeOutput(BaseModel):
     html_content: str = Field(..., description="Generated resume content in HTML format")
     image_placeholders: Dict[str, str] = Field(..., description="Image placeholders found in the content")
+    usage: Optional[Dict[str, Any]] = Field(None, description="Prompt and output token counts for this request")
 
 
 class ImageResponse(BaseModel):
-    image_data: str = Field(..., description="Base64 encoded image data")
+    image_data: str = Field(..., description="Base64 encoded image data, or an /api/image/blob URL when as_url is set")
     placeholder_id: str = Field(..., description="Identifier for the image placeholder")
 
 class ImageGenerationInput(BaseModel):
     prompt: str
     placeholder_id: str
+    as_url: bool = Field(False, description="Return image_data as a blob URL instead of a data URI")
 
 class ImageSearchInput(BaseModel):
     query: str
     placeholder_id: str
+    count: int = Field(6, ge=1, le=30, description="Number of candidate images to return")
+    as_url: bool = Field(False, description="Return image_data as a cached blob URL, which may expire, instead of a data URI")
 
+class ImageSelectInput(BaseModel):
+    image_url: str = Field(..., description="full_image_url of the chosen search result")
+    placeholder_id: str
+    as_url: bool = Field(False, description="Return image_data as a blob URL instead of a data URI")
+
+
+class ImageResolveStrategy(str, Enum):
+    SEARCH = "search"
+    GENERATE = "generate"
+    PLACEHOLDER = "placeholder"
+
+class ImageResolveBatchInput(BaseModel):
+    placeholders: Dict[str, str] = Field(
+        ..., min_length=1, max_length=50,
+        description="Placeholder ID -> alt text, as returned in image_placeholders"
+    )
+    strategies: Dict[str, ImageResolveStrategy] = Field(
+        default_factory=dict, description="Strategy per placeholder ID; others use default_strategy"
+    )
+    default_strategy: ImageResolveStrategy = ImageResolveStrategy.SEARCH
+    as_url: bool = Field(False, description="Return image_data as a blob URL instead of a data URI")
 
 class SearchResult(ImageResponse):
-    description: Optional[str] = Field(None, description="Description of the image")
\ No newline at end of file
+    description: Optional[str] = Field(None, description="Description of the image")
+    full_image_url: Optional[str] = Field(None, description="Full-size rendition, fetched via /api/image/select")
+    photographer: Optional[str] = Field(None, description="Photographer name for attribution")
+    attribution_url: Optional[str] = Field(None, description="Unsplash page of the photo")
\ No newline at end of file
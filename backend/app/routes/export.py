@@ -1,43 +1,178 @@
-from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import FileResponse
-import tempfile
-import os
-from app.models.export import ExportRequest
-from app.services.export_service import export_resume
+from fastapi import APIRouter, HTTPException, Body, Header, Response
+from fastapi.responses import StreamingResponse
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote
+import asyncio
+import io
+import zipfile
+from app.models.export import (
+    EXPORT_MEDIA_TYPES,
+    ExportBundleRequest,
+    ExportFormat,
+    ExportJobStatus,
+    ExportRequest
+)
+from app.services.export_jobs import ExportQueueFull, export_jobs
+from app.services.render_engine import export_cache_key, render_engine
 from app.utils.logger import app_logger
+from app.utils.metrics import ERRORS_TOTAL
 
 router = APIRouter()
 
+# Size of each chunk when streaming an export back to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _iter_chunks(content: bytes) -> Iterator[bytes]:
+    view = memoryview(content)
+    for start in range(0, len(view), STREAM_CHUNK_SIZE):
+        yield bytes(view[start:start + STREAM_CHUNK_SIZE])
+
+def _content_disposition(stem: str, extension: str) -> str:
+    # ASCII fallback plus RFC 5987 encoding for non-ASCII (e.g. Chinese) names
+    ascii_stem = stem.encode("ascii", "ignore").decode().replace('"', "").strip() or "resume"
+    return (
+        f"attachment; filename=\"{ascii_stem}.{extension}\"; "
+        f"filename*=UTF-8''{quote(f'{stem}.{extension}')}"
+    )
+
+def _build_zip(documents: Dict[str, bytes], filename: str) -> bytes:
+    buffered = io.BytesIO()
+    with zipfile.ZipFile(buffered, "w") as archive:
+        for export_format, content in documents.items():
+            # docx, pptx and pdf are already compressed; only deflate the text formats
+            compression = zipfile.ZIP_DEFLATED if export_format in ("md", "html") else zipfile.ZIP_STORED
+            archive.writestr(f"{filename}.{export_format}", content, compress_type=compression)
+    return buffered.getvalue()
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def _export_response(
+    content: bytes,
+    export_format: ExportFormat,
+    filename: str,
+    etag: str
+) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_chunks(content),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": _content_disposition(filename, export_format.value),
+            "Content-Length": str(len(content)),
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+        }
+    )
+
 @router.post("/convert")
-async def convert_resume(input_data: ExportRequest = Body(...)):
+async def convert_resume(
+    input_data: ExportRequest = Body(...),
+    if_none_match: Optional[str] = Header(None)
+):
     try:
-        # Create a temporary file for the exported resume
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{input_data.format.value}") as temp_file:
-            temp_filename = temp_file.name
+        # The strong ETag identifies the render inputs, so a match means the
+        # client already has this exact document
+        options = input_data.options.model_dump()
+        cache_key = export_cache_key(input_data.html_content, input_data.format.value, options)
+        etag = f'"{cache_key}"'
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
         
-        # Export the resume to the specified format
-        export_resume(
+        # Render the resume in memory in the render pool (or reuse a cached render)
+        content = await render_engine.render(
             html_content=input_data.html_content,
             output_format=input_data.format.value,
-            output_path=temp_filename
+            options=options,
+            cache_key=cache_key
         )
         
-        # Return the file for download
-        return FileResponse(
-            path=temp_filename,
-            filename=f"{input_data.filename}.{input_data.format.value}",
-            media_type=f"application/{input_data.format.value}",
-            background=lambda: os.unlink(temp_filename)  # Delete after download
+        # Stream the document back without touching the disk
+        return _export_response(content, input_data.format, input_data.filename, etag)
+    except Exception as e:
+        ERRORS_TOTAL.labels("export").inc()
+        app_logger.error(f"Error exporting resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error exporting resume: {str(e)}")
+    
+@router.post("/bundle")
+async def export_bundle(input_data: ExportBundleRequest = Body(...)):
+    try:
+        # One upload, rendered into every requested format in parallel
+        formats: List[ExportFormat] = list(dict.fromkeys(input_data.formats))
+        documents = await render_engine.render_bundle(
+            html_content=input_data.html_content,
+            output_formats=[export_format.value for export_format in formats],
+            options=input_data.options.model_dump()
         )
+        
+        content = await asyncio.to_thread(_build_zip, documents, input_data.filename)
+        return StreamingResponse(
+            _iter_chunks(content),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": _content_disposition(input_data.filename, "zip"),
+                "Content-Length": str(len(content)),
+            }
+        )
+    except Exception as e:
+        ERRORS_TOTAL.labels("export").inc()
+        app_logger.error(f"Error exporting resume bundle: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error exporting resume bundle: {str(e)}")
+    
+@router.post("/jobs", status_code=202, response_model=ExportJobStatus)
+async def submit_export_job(input_data: ExportRequest = Body(...)):
+    try:
+        job = export_jobs.submit(
+            html_content=input_data.html_content,
+            output_format=input_data.format.value,
+            filename=input_data.filename,
+            options=input_data.options.model_dump()
+        )
+        return job.to_dict()
+    except ExportQueueFull as e:
+        app_logger.warning(str(e))
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        ERRORS_TOTAL.labels("export").inc()
+        app_logger.error(f"Error submitting export job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error submitting export job: {str(e)}")
+
+@router.get("/jobs/{job_id}", response_model=ExportJobStatus)
+async def get_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Error exporting resume: {job.error}")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    export_format = ExportFormat(job.format)
+    try:
+        content = await export_jobs.result(job)
     except Exception as e:
+        ERRORS_TOTAL.labels("export").inc()
         app_logger.error(f"Error exporting resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error exporting resume: {str(e)}")
+    return _export_response(content, export_format, job.filename, f'"{job.cache_key}"')
     
 # 当运行此脚本是，测试一下这个接口的功能函数convert_resume
 if __name__ == "__main__":
     from app.models.export import ExportFormat
     from app.models.export import ExportRequest
-    import asyncio
 
     # Create a test ExportRequest object
     test_request = ExportRequest(
@@ -1,48 +1,163 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Body, Form
-from typing import List
-from app.models.resume import ImageResponse, ImageGenerationInput, ImageSearchInput
+from fastapi import APIRouter, HTTPException, UploadFile, File, Body, Form, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from typing import Any, AsyncIterator, Callable, Dict, List
+import asyncio
+import re
+from app.models.resume import (
+    ImageResponse,
+    ImageGenerationInput,
+    ImageResolveBatchInput,
+    ImageSearchInput,
+    ImageSelectInput,
+    SearchResult
+)
 from app.services.image_service import (
+    UploadRejected,
+    check_upload_length,
     process_uploaded_image,
+    resolve_placeholders,
     search_image,
+    select_image,
     generate_image
 )
+from app.services.image_store import get_image, store_data_uri
+from app.utils.image_helpers import sniff_image_type
 from app.utils.logger import app_logger
+from app.utils.metrics import ERRORS_TOTAL
+from app.utils.sse import format_sse_event
+
+class UploadRoute(APIRoute):
+    """Route that refuses oversized requests by Content-Length before the multipart form is parsed"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            try:
+                check_upload_length(request.headers.get("content-length"))
+            except UploadRejected as e:
+                raise HTTPException(status_code=e.status_code, detail=str(e))
+            return await handler(request)
+
+        return limited_handler
 
 router = APIRouter()
+upload_router = APIRouter(route_class=UploadRoute)
+
+# Blobs are addressed by their content, so a URL never changes meaning
+BLOB_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_CONTENT_HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+async def _with_blob_url(result: Dict[str, Any], request: Request, pinned: bool = True) -> Dict[str, Any]:
+    """
+    Move a result's data URI into the image store and return its blob URL instead
+
+    Images meant for the resume are pinned with the uploads; search thumbnails
+    only go to the evictable cache. Drawn fallback placeholders stay data URIs.
+    """
+    if result.get("fallback"):
+        return result
+    content_hash = await asyncio.to_thread(store_data_uri, result["image_data"], pinned)
+    if content_hash is None:
+        return result
+    # Root-relative, so the URL holds behind a proxy that does not forward the public host
+    return {**result, "image_data": str(request.app.url_path_for("get_image_blob", content_hash=content_hash))}
 
-@router.post("/upload", response_model=ImageResponse)
+@router.get("/blob/{content_hash}")
+async def get_image_blob(content_hash: str, request: Request):
+    if not _CONTENT_HASH_PATTERN.fullmatch(content_hash):
+        raise HTTPException(status_code=404, detail="Image not found")
+    etag = f'"{content_hash}"'
+    headers = {"Cache-Control": BLOB_CACHE_CONTROL, "ETag": etag, "X-Content-Type-Options": "nosniff"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    image_data = await asyncio.to_thread(get_image, content_hash)
+    if image_data is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    media_type = sniff_image_type(image_data) or "application/octet-stream"
+    return Response(content=image_data, media_type=media_type, headers=headers)
+
+@upload_router.post("/upload", response_model=ImageResponse)
 async def upload_image(
+    request: Request,
     file: UploadFile = File(...),
-    placeholder_id: str = Form(...)
+    placeholder_id: str = Form(...),
+    as_url: bool = Form(False)
 ):
     try:
         result = await process_uploaded_image(file, placeholder_id)
-        return result
+        return await _with_blob_url(result, request) if as_url else result
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
+        ERRORS_TOTAL.labels("image_upload").inc()
         app_logger.error(f"Error processing image: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing image: {str(e)}")
 
-@router.post("/search", response_model=List[ImageResponse])
-async def search_for_image(input_data: ImageSearchInput):
+router.include_router(upload_router)
+
+@router.post("/search", response_model=List[SearchResult])
+async def search_for_image(input_data: ImageSearchInput, request: Request):
     try:
-        results = await search_image(input_data.query, input_data.placeholder_id)
+        results = await search_image(input_data.query, input_data.placeholder_id, input_data.count)
+        if input_data.as_url:
+            results = [await _with_blob_url(result, request, pinned=False) for result in results]
         return results
     except Exception as e:
         app_logger.error(f"Error searching for image: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error searching for image: {str(e)}")
 
+@router.post("/select", response_model=ImageResponse)
+async def select_search_result(input_data: ImageSelectInput, request: Request):
+    try:
+        result = await select_image(input_data.image_url, input_data.placeholder_id)
+        return await _with_blob_url(result, request) if input_data.as_url else result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        ERRORS_TOTAL.labels("image_search").inc()
+        app_logger.error(f"Error fetching selected image: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching selected image: {str(e)}")
+
 @router.post("/generate", response_model=ImageResponse)
-async def generate_image_from_prompt(input_data: ImageGenerationInput):
+async def generate_image_from_prompt(input_data: ImageGenerationInput, request: Request):
     try:
-        result = generate_image(input_data.prompt, input_data.placeholder_id)
-        return result
+        result = await generate_image(input_data.prompt, input_data.placeholder_id)
+        return await _with_blob_url(result, request) if input_data.as_url else result
     except Exception as e:
         app_logger.error(f"Error generating image: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating image: {str(e)}")
+
+@router.post("/resolve-batch")
+async def resolve_placeholder_batch(input_data: ImageResolveBatchInput, request: Request):
+    strategies = {pid: strategy.value for pid, strategy in input_data.strategies.items()}
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for result in resolve_placeholders(
+                input_data.placeholders,
+                strategies,
+                input_data.default_strategy.value
+            ):
+                if input_data.as_url and "image_data" in result:
+                    result = await _with_blob_url(result, request)
+                yield format_sse_event("image", result)
+            yield format_sse_event("done", {"count": len(input_data.placeholders)})
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            app_logger.error(f"Error resolving placeholders: {str(e)}")
+            yield format_sse_event("error", {"detail": f"Error resolving placeholders: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
     
 # 当运行此脚本是，测试一下这个接口的功能函数upload_image，search_for_image，generate_image_from_prompt
 if __name__ == "__main__":
-    import asyncio
     from app.models.resume import ImageSearchInput, ImageGenerationInput
 
     # Test upload_image
@@ -71,7 +186,7 @@ if __name__ == "__main__":
         await search_for_image(test_input)
 
     # Test generate_image_from_prompt
-    def test_generate_image_from_prompt():
+    async def test_generate_image_from_prompt():
         # Create a test ImageGenerationInput object
         test_input = ImageGenerationInput(
             prompt="A cat sitting on a table",
@@ -79,9 +194,9 @@ if __name__ == "__main__":
         )
 
         # Run the test
-        generate_image_from_prompt(test_input)
+        await generate_image_from_prompt(test_input)
 
     # Run the tests
     asyncio.run(test_upload_image())
     asyncio.run(test_search_for_image())
-    test_generate_image_from_prompt()
\ No newline at end of file
+    asyncio.run(test_generate_image_from_prompt())
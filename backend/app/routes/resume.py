@@ -1,16 +1,23 @@
 from fastapi import APIRouter, HTTPException, Body
-from typing import Optional, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, Any, AsyncIterator
 from app.models.resume import ResumeInput, ResumeOutput
-from app.services.llm_service import generate_resume_content
+from app.services.llm_service import (
+    UPDATE_MODE,
+    UpdateMode,
+    generate_resume_content,
+    generate_resume_content_stream
+)
 from app.utils.logger import app_logger
+from app.utils.sse import format_sse_event
 
 router = APIRouter()
 
 @router.post("/generate", response_model=ResumeOutput)
-def generate_resume(input_data: ResumeInput = Body(...)):
+async def generate_resume(input_data: ResumeInput = Body(...)):
     try:
         # Generate resume using LLM
-        result = generate_resume_content(
+        result = await generate_resume_content(
             name=input_data.name,
             position=input_data.position,
             additional_info=input_data.additional_info or {}
@@ -20,20 +27,45 @@ def generate_resume(input_data: ResumeInput = Body(...)):
         app_logger.error(f"Error generating resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating resume: {str(e)}")
 
+@router.post("/generate/stream")
+async def generate_resume_stream(input_data: ResumeInput = Body(...)):
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in generate_resume_content_stream(
+                name=input_data.name,
+                position=input_data.position,
+                additional_info=input_data.additional_info or {}
+            ):
+                yield format_sse_event(event["event"], event["data"])
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            app_logger.error(f"Error streaming resume: {str(e)}")
+            yield format_sse_event("error", {"detail": f"Error generating resume: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/update", response_model=ResumeOutput)
-def update_resume(
+async def update_resume(
     html_content: str = Body(...),
     name: str = Body("Xiao Han"),
     position: str = Body("Algorithm Engineer"),
-    additional_info: Optional[Dict[str, Any]] = Body(None)
+    additional_info: Optional[Dict[str, Any]] = Body(None),
+    update_instructions: Optional[str] = Body(None),
+    update_mode: UpdateMode = Body(UPDATE_MODE)
 ):
     try:
         # Update existing resume content
-        result = generate_resume_content(
+        result = await generate_resume_content(
             name=name,
             position=position,
             additional_info=additional_info or {},
-            existing_content=html_content
+            existing_content=html_content,
+            update_instructions=update_instructions,
+            update_mode=update_mode
         )
         return result
     except Exception as e:
@@ -42,6 +74,7 @@ def update_resume(
     
 # 当运行此脚本是，测试一下这个接口的功能函数generate_resume，update_resume
 if __name__ == "__main__":
+    import asyncio
     from app.models.resume import ResumeInput
 
     # Test generate_resume
@@ -54,7 +87,7 @@ if __name__ == "__main__":
         )
 
         # Run the test
-        result = generate_resume(test_request)
+        result = asyncio.run(generate_resume(test_request))
         print(result)
 
     # Test update_resume
@@ -63,7 +96,7 @@ if __name__ == "__main__":
         test_html = "<div>Test HTML content</div>"
 
         # Run the test
-        result = update_resume(test_html)
+        result = asyncio.run(update_resume(test_html))
         print(result)
 
     test_generate_resume()
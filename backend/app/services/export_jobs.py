@@ -0,0 +1,217 @@
+import asyncio
+import math
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from app.services.render_engine import export_cache_key, render_engine
+from app.utils.logger import app_logger
+from app.utils.metrics import (
+    ERRORS_TOTAL,
+    EXPORT_JOB_RUN_SECONDS,
+    EXPORT_JOBS_TOTAL,
+    EXPORT_QUEUE_DEPTH,
+    EXPORT_QUEUE_WAIT_SECONDS
+)
+
+# Export job queue settings
+EXPORT_QUEUE_DEPTH_LIMIT = int(os.getenv("EXPORT_QUEUE_DEPTH", "100"))
+EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS", str(render_engine.workers)))
+EXPORT_JOB_TTL_SECONDS = float(os.getenv("EXPORT_JOB_TTL", "600"))
+# How often expired jobs are dropped when nobody polls
+EXPORT_JOB_PURGE_SECONDS = 60.0
+
+
+class ExportQueueFull(Exception):
+    """Raised when the export queue is at capacity"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Export queue is full, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class ExportJob:
+    """One queued export; the rendered document lives in export_cache under cache_key"""
+
+    def __init__(
+        self,
+        html_content: str,
+        output_format: str,
+        filename: str,
+        options: Optional[Dict[str, Any]] = None
+    ):
+        self.id = uuid.uuid4().hex
+        self.html_content = html_content
+        self.format = output_format
+        self.filename = filename
+        self.options = options
+        # Identifies the rendered document, shared with /convert's ETag
+        self.cache_key = export_cache_key(html_content, output_format, options)
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "format": self.format,
+            "filename": self.filename,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class ExportJobQueue:
+    """
+    Bounded queue of export jobs drained by a fixed number of worker tasks.
+
+    Submitting to a full queue fails fast with ExportQueueFull instead of
+    piling more work onto the render pool. Finished jobs are kept for
+    EXPORT_JOB_TTL_SECONDS so clients can poll and download them; a job keeps
+    only its inputs and cache key, and its document is read back from the
+    export cache (and re-rendered if it has been evicted) on download.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = EXPORT_QUEUE_DEPTH_LIMIT,
+        workers: int = EXPORT_JOB_WORKERS,
+        ttl_seconds: float = EXPORT_JOB_TTL_SECONDS
+    ):
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.ttl_seconds = ttl_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: Dict[str, ExportJob] = {}
+        # Recent run times, used to estimate Retry-After
+        self._average_run_seconds = 1.0
+
+    def start(self) -> None:
+        """Create the queue and its worker tasks"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_depth)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._purger()))
+            app_logger.info(f"Export job queue started with {self.workers} workers, depth {self.max_depth}")
+
+    async def shutdown(self) -> None:
+        """Stop the worker tasks; queued jobs are dropped"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        EXPORT_QUEUE_DEPTH.set(0)
+
+    def submit(
+        self,
+        html_content: str,
+        output_format: str,
+        filename: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> ExportJob:
+        """
+        Queue an export job
+
+        Args:
+            html_content: The HTML content to export
+            output_format: The desired output format
+            filename: Name for the exported file (without extension)
+            options: Render options (image_dpi, jpeg_quality, optimize_images)
+
+        Returns:
+            The queued job
+
+        Raises:
+            ExportQueueFull: If the queue is at capacity
+        """
+        self.start()
+        self._purge_expired()
+        job = ExportJob(html_content, output_format, filename, options)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            EXPORT_JOBS_TOTAL.labels("rejected").inc()
+            raise ExportQueueFull(self.retry_after())
+        self._jobs[job.id] = job
+        EXPORT_QUEUE_DEPTH.set(self._queue.qsize())
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """Look up a job by id"""
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def result(self, job: ExportJob) -> bytes:
+        """
+        Fetch a finished job's document
+
+        Args:
+            job: A job with status "done"
+
+        Returns:
+            The rendered document, from the export cache or rendered again if it was evicted
+        """
+        return await render_engine.render(job.html_content, job.format, job.options, job.cache_key)
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained enough to accept a job"""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return max(1, math.ceil(depth * self._average_run_seconds / self.workers))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            EXPORT_QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ExportJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        EXPORT_QUEUE_WAIT_SECONDS.observe(job.started_at - job.created_at)
+        try:
+            with EXPORT_JOB_RUN_SECONDS.labels(job.format).time():
+                # Leaves the document in export_cache under job.cache_key
+                await render_engine.render(job.html_content, job.format, job.options, job.cache_key)
+            job.status = "done"
+            EXPORT_JOBS_TOTAL.labels("done").inc()
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            EXPORT_JOBS_TOTAL.labels("failed").inc()
+            ERRORS_TOTAL.labels("export").inc()
+            app_logger.error(f"Export job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            if job.status == "failed":
+                # A failed job is never downloaded
+                job.html_content = ""
+            run_seconds = job.finished_at - job.started_at
+            self._average_run_seconds = 0.8 * self._average_run_seconds + 0.2 * run_seconds
+
+    async def _purger(self) -> None:
+        while True:
+            await asyncio.sleep(min(EXPORT_JOB_PURGE_SECONDS, self.ttl_seconds))
+            self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Shared queue, started and stopped in the FastAPI lifespan
+export_jobs = ExportJobQueue()
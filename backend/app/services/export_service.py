@@ -1,90 +1,206 @@
 import os
 import markdown
-import tempfile
-from weasyprint import HTML, CSS
+from typing import Any, Dict, Optional
+from weasyprint import HTML, CSS, default_url_fetcher
+from weasyprint.text.fonts import FontConfiguration
+from app.models.export import RenderOptions
+from app.services.image_store import load_blob_url
+from app.services.office_exporters import html_to_docx, html_to_pptx
+from app.utils.image_helpers import sniff_image_type
+from app.utils.html_to_markdown import html_to_markdown
 from app.utils.logger import app_logger
+from app.utils.print_images import IMAGE_LAYOUTS, prepare_print_images
+from app.utils.templates import DEFAULT_RESUME_SKELETON, DEFAULT_RESUME_STYLE
 
-# Add support for other formats
-import pypandoc
+# CJK font used when the template fonts (SimSun / Microsoft YaHei) are not installed
+PDF_CJK_FONT = os.getenv("PDF_CJK_FONT", "Noto Sans CJK SC")
 
-def export_resume(html_content: str, output_format: str, output_path: str) -> str:
+# Defaults for the render options exposed through ExportRequest
+DEFAULT_RENDER_OPTIONS = RenderOptions().model_dump()
+
+# The template stylesheet exactly as it is embedded by the document shell
+TEMPLATE_STYLE_BLOCK = "<style>" + DEFAULT_RESUME_STYLE + "</style>"
+TEMPLATE_FONT_STACK = '"SimSun", "Microsoft YaHei", sans-serif'
+
+# Base for root-relative URLs in the resume HTML, such as image-store blob URLs.
+# fetch_url serves blobs locally and never requests anything else under this base.
+DOCUMENT_BASE_URL = "http://localhost/"
+
+
+def fetch_url(url: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """WeasyPrint URL fetcher that reads image-store URLs locally and defers the rest"""
+    image_data = load_blob_url(url)
+    if image_data is not None:
+        return {"string": image_data, "mime_type": sniff_image_type(image_data), "redirected_url": url}
+    if url.startswith(DOCUMENT_BASE_URL):
+        raise ValueError(f"No local resource for {url}")
+    return default_url_fetcher(url, *args, **kwargs)
+
+
+class PdfRenderContext:
     """
-    Export resume HTML to various formats
+    Per-process WeasyPrint state: a shared FontConfiguration and a CJK fallback.
+
+    Holds one FontConfiguration, so fontconfig lookups for the CJK font stack
+    are resolved once per worker rather than once per render, and a default
+    stylesheet naming the CJK fallback font. The template stylesheet is not
+    cached: it stays inline in the document and is parsed on every render,
+    so its rules keep author origin and the cascade with any other document
+    CSS is unchanged (WeasyPrint only accepts pre-parsed sheets at user
+    origin).
+    """
+
+    def __init__(self, cjk_font: str = PDF_CJK_FONT):
+        self.font_config = FontConfiguration()
+        font_stack = TEMPLATE_FONT_STACK
+        if cjk_font:
+            font_stack = font_stack.replace("sans-serif", f'"{cjk_font}", sans-serif')
+        # Same inline block, with the CJK font added to its font stack
+        self.template_style_block = TEMPLATE_STYLE_BLOCK.replace(TEMPLATE_FONT_STACK, font_stack)
+        # User-origin default, so any font-family set by the document still wins
+        self.fallback_css = CSS(
+            string=f"html {{ font-family: {font_stack}; }}",
+            font_config=self.font_config
+        )
+
+    def write_pdf(self, html_content: str, **options: Any) -> bytes:
+        """
+        Render HTML to PDF with this process's fonts
+
+        Args:
+            html_content: The HTML content to render
+            options: Extra WeasyPrint write_pdf options (e.g. optimize_images, jpeg_quality, dpi)
+
+        Returns:
+            The PDF document
+        """
+        if TEMPLATE_STYLE_BLOCK in html_content:
+            html_content = html_content.replace(TEMPLATE_STYLE_BLOCK, self.template_style_block, 1)
+        return HTML(string=html_content, base_url=DOCUMENT_BASE_URL, url_fetcher=fetch_url).write_pdf(
+            stylesheets=[self.fallback_css],
+            font_config=self.font_config,
+            **options
+        )
+
+
+_pdf_context: Optional[PdfRenderContext] = None
+
+def get_pdf_render_context() -> PdfRenderContext:
+    """Return this process's PdfRenderContext, building it on first use"""
+    global _pdf_context
+    if _pdf_context is None:
+        _pdf_context = PdfRenderContext()
+    return _pdf_context
+
+def warm_up() -> None:
+    """Build the PDF render context and resolve the template fonts with a throwaway render"""
+    context = get_pdf_render_context()
+    context.write_pdf(
+        '<html lang="zh-CN"><head>' + TEMPLATE_STYLE_BLOCK + "</head><body>"
+        + DEFAULT_RESUME_SKELETON + "</body></html>"
+    )
+
+def prepare_export_images(
+    html_content: str,
+    output_format: str,
+    options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Shrink embedded images to the size the format shows them at before the renderer decodes them
+
+    Args:
+        html_content: The HTML content to export
+        output_format: The desired output format
+        options: Render options (image_dpi, jpeg_quality, optimize_images); see DEFAULT_RENDER_OPTIONS
+
+    Returns:
+        The HTML with downsampled images, or unchanged if the format's images are left as they are
+    """
+    options = {**DEFAULT_RENDER_OPTIONS, **(options or {})}
+    if not options["optimize_images"] or output_format not in IMAGE_LAYOUTS:
+        return html_content
+    return prepare_print_images(
+        html_content,
+        dpi=options["image_dpi"],
+        jpeg_quality=options["jpeg_quality"],
+        output_format=output_format
+    )
+
+
+def render_resume(
+    html_content: str,
+    output_format: str,
+    options: Optional[Dict[str, Any]] = None,
+    images_prepared: bool = False
+) -> bytes:
+    """
+    Render resume HTML to various formats in memory
     
     Args:
         html_content: The HTML content to export
         output_format: The desired output format (pdf, docx, pptx, md, html)
-        output_path: Path where the exported file should be saved
+        options: Render options (image_dpi, jpeg_quality, optimize_images); see DEFAULT_RENDER_OPTIONS
+        images_prepared: True if html_content already went through prepare_export_images for this format
         
     Returns:
-        Path to the exported file
+        The rendered document
     """
     app_logger.info(f"Exporting resume to {output_format} format")
+    options = {**DEFAULT_RENDER_OPTIONS, **(options or {})}
     
-    # Create output directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    if not images_prepared:
+        html_content = prepare_export_images(html_content, output_format, options)
     
     if output_format == "html":
-        # Simply save the HTML
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        app_logger.info(f"Exported HTML to {output_path}")
-        return output_path
+        return html_content.encode("utf-8")
     
     elif output_format == "md":
-        # Convert HTML to markdown using pypandoc
-        try:
-            md_content = pypandoc.convert_text(html_content, 'md', format='html')
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(md_content)
-            app_logger.info(f"Exported markdown to {output_path}")
-            return output_path
-        except Exception as e:
-            app_logger.error(f"Error converting HTML to markdown: {str(e)}")
-            raise
+        # Convert HTML to markdown in-process
+        return html_to_markdown(html_content).encode("utf-8")
     
     elif output_format == "pdf":
-        # Save HTML to a temporary file
-        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as temp:
-            temp_html_path = temp.name
-            temp.write(html_content.encode('utf-8'))
-        
-        try:
-            # Convert HTML to PDF using WeasyPrint
-            HTML(temp_html_path).write_pdf(output_path)
-            app_logger.info(f"Exported PDF to {output_path}")
-            return output_path
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(temp_html_path):
-                os.unlink(temp_html_path)
+        # Convert HTML to PDF using WeasyPrint, reusing this process's fonts and stylesheet
+        return get_pdf_render_context().write_pdf(
+            html_content,
+            optimize_images=options["optimize_images"],
+            jpeg_quality=options["jpeg_quality"],
+            dpi=options["image_dpi"]
+        )
     
-    elif output_format == "docx" or output_format == "pptx":
-        # Save HTML to a temporary file
-        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as temp:
-            temp_html_path = temp.name
-            temp.write(html_content.encode('utf-8'))
-        
-        try:
-            # Run pandoc to convert HTML to the desired format
-            app_logger.info(f"Converting to {output_format} using pandoc")
-            pypandoc.convert_file(
-                temp_html_path,
-                output_format,
-                outputfile=output_path,
-                extra_args=['--standalone']
-            )
-            app_logger.info(f"Exported {output_format.upper()} to {output_path}")
-            return output_path
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(temp_html_path):
-                os.unlink(temp_html_path)
+    elif output_format == "docx":
+        # Build the Word document in-process with python-docx
+        return html_to_docx(html_content)
+    
+    elif output_format == "pptx":
+        # Build the slide deck in-process with python-pptx
+        return html_to_pptx(html_content)
     
     else:
         error_msg = f"Unsupported output format: {output_format}"
         app_logger.error(error_msg)
         raise ValueError(error_msg)
+
+def export_resume(html_content: str, output_format: str, output_path: str) -> str:
+    """
+    Export resume HTML to various formats
+    
+    Args:
+        html_content: The HTML content to export
+        output_format: The desired output format (pdf, docx, pptx, md, html)
+        output_path: Path where the exported file should be saved
+        
+    Returns:
+        Path to the exported file
+    """
+    content = render_resume(html_content, output_format)
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(content)
+    
+    app_logger.info(f"Exported {output_format.upper()} to {output_path}")
+    return output_path
     
 # 当运行此脚本是，测试一下这个接口的功能函数convert_resume
 if __name__ == "__main__":
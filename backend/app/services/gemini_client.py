@@ -0,0 +1,77 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from google import genai
+from google.genai import types
+from app.utils.logger import app_logger
+
+# Google Gemini API settings
+API_KEY = os.getenv("GEMINI_API_KEY", "")  # Replace with your API key in production
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "64"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "120"))
+
+# Process-wide client and concurrency cap, created in the FastAPI lifespan
+_client: Optional[genai.Client] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def init_gemini_client() -> genai.Client:
+    """
+    Create the shared Gemini client
+
+    The client keeps its HTTP connection pool for the lifetime of the process,
+    so every request after the first reuses already-open connections.
+
+    Returns:
+        The shared client instance
+    """
+    global _client, _semaphore
+    if _client is None:
+        _client = genai.Client(
+            api_key=API_KEY,
+            http_options=types.HttpOptions(timeout=int(GEMINI_TIMEOUT_SECONDS * 1000))
+        )
+        _semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        app_logger.info(
+            f"Gemini client initialised (max concurrency {GEMINI_MAX_CONCURRENCY})"
+        )
+    return _client
+
+
+async def close_gemini_client() -> None:
+    """Close the shared Gemini client and release its connections"""
+    global _client, _semaphore
+    if _client is None:
+        return
+    try:
+        await _client.aio.aclose()
+        _client.close()
+    except Exception as e:
+        app_logger.error(f"Error closing Gemini client: {str(e)}")
+    _client = None
+    _semaphore = None
+    app_logger.info("Gemini client closed")
+
+
+def get_gemini_client() -> genai.Client:
+    """
+    Get the shared Gemini client, creating it on first use outside the app lifespan
+
+    Returns:
+        The shared client instance
+    """
+    return _client if _client is not None else init_gemini_client()
+
+
+@asynccontextmanager
+async def gemini_slot() -> AsyncIterator[genai.client.AsyncClient]:
+    """
+    Acquire one of the GEMINI_MAX_CONCURRENCY upstream slots
+
+    Yields:
+        The async interface of the shared client
+    """
+    client = get_gemini_client()
+    async with _semaphore:
+        yield client.aio
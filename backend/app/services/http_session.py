@@ -0,0 +1,62 @@
+import os
+from typing import Optional
+import aiohttp
+from app.utils.logger import app_logger
+
+# Outbound HTTP connection pool settings
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "16"))
+HTTP_DNS_CACHE_SECONDS = int(os.getenv("HTTP_DNS_CACHE_SECONDS", "300"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+
+# Process-wide session, created in the FastAPI lifespan
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def init_http_session() -> aiohttp.ClientSession:
+    """
+    Create the shared aiohttp session
+
+    The connector keeps connections to api.unsplash.com and the image CDN
+    alive between requests and caches DNS lookups, so repeat searches skip
+    the DNS, TCP and TLS setup. Must be called from a running event loop.
+
+    Returns:
+        The shared session
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        app_logger.info(
+            f"HTTP session initialised ({HTTP_MAX_CONNECTIONS_PER_HOST} connections per host)"
+        )
+    return _session
+
+
+async def close_http_session() -> None:
+    """Close the shared session and its pooled connections"""
+    global _session
+    if _session is None:
+        return
+    try:
+        await _session.close()
+    except Exception as e:
+        app_logger.error(f"Error closing HTTP session: {str(e)}")
+    _session = None
+    app_logger.info("HTTP session closed")
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared session, creating it on first use outside the app lifespan
+
+    Returns:
+        The shared session
+    """
+    return _session if _session is not None and not _session.closed else init_http_session()
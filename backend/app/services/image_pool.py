@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.utils.logger import app_logger
+from app.utils.metrics import IMAGE_POOL_WAIT_SECONDS, IMAGE_TASK_SECONDS
+
+# Image pool settings
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+IMAGE_MAX_PENDING = int(os.getenv("IMAGE_MAX_PENDING", "32"))
+
+
+class ImagePool:
+    """
+    Bounded thread pool for Pillow work (decode, resize, encode).
+
+    Pillow releases the GIL inside its C decoders, resamplers and encoders, so
+    a few threads keep large images off the event loop without the pickling
+    cost of a process pool. A semaphore caps how many tasks may be queued or
+    running at once, so a burst of uploads cannot pile up unbounded memory.
+    """
+
+    def __init__(self, workers: int = IMAGE_WORKERS, max_pending: int = IMAGE_MAX_PENDING):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def start(self) -> None:
+        """Create the thread pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image")
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            app_logger.info(f"Image pool started with {self.workers} threads")
+
+    def shutdown(self) -> None:
+        """Stop the thread pool, waiting for running tasks"""
+        executor, self._executor = self._executor, None
+        self._semaphore = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            app_logger.info("Image pool stopped")
+
+    async def run(self, func: Callable[..., Any], *args: Any, label: str = "task", **kwargs: Any) -> Any:
+        """
+        Run a Pillow function in the pool and await its result
+
+        Args:
+            func: Function to run
+            args: Positional arguments
+            label: Task label used for the timing metric
+            kwargs: Keyword arguments
+
+        Returns:
+            The function's return value
+        """
+        self.start()
+        wait_start = time.perf_counter()
+        async with self._semaphore:
+            IMAGE_POOL_WAIT_SECONDS.observe(time.perf_counter() - wait_start)
+            timed = functools.partial(_timed_call, func, label, args, kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+
+
+def _timed_call(func: Callable[..., Any], label: str, args: tuple, kwargs: dict) -> Any:
+    # Timed inside the worker thread, so queueing is not counted
+    with IMAGE_TASK_SECONDS.labels(label).time():
+        return func(*args, **kwargs)
+
+
+# Shared pool, started and stopped in the FastAPI lifespan
+image_pool = ImagePool()
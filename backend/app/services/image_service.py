@@ -1,19 +1,79 @@
 from fastapi import UploadFile
-from typing import Dict, List, Any
+from typing import Any, AsyncIterator, Dict, List, Optional
 import base64
-import io
-from PIL import Image
 import os
 import aiohttp
 import asyncio
-from urllib.parse import quote_plus
-from google import genai
+from PIL import Image, UnidentifiedImageError
+from urllib.parse import quote_plus, urlparse
 from google.genai import types
+from app.services.gemini_client import gemini_slot
+from app.services.http_session import get_http_session
+from app.services.image_pool import image_pool
+from app.services.image_store import image_store, store_image
+from app.utils.cache import CACHE_DIR, ResponseCache, make_cache_key
 from app.utils.logger import app_logger
-from app.utils.image_helpers import create_placeholder_image, resize_image
+from app.utils.image_helpers import (
+    create_placeholder_image,
+    optimize_image,
+    read_image_size,
+    reencode_jpeg,
+    sniff_image_type
+)
+from app.utils.singleflight import SingleFlight, normalize_key
+from app.utils.metrics import (
+    ERRORS_TOTAL,
+    FALLBACK_PLACEHOLDERS_TOTAL,
+    GEMINI_LATENCY,
+    IMAGE_UPLOAD_BYTES,
+    IMAGE_UPLOAD_PIXELS,
+    IMAGE_UPLOADS_REJECTED_TOTAL,
+    UNSPLASH_FETCH_SECONDS
+)
 
-# Initialize Google Gemini API client
-API_KEY = os.getenv("GEMINI_API_KEY", "your_api_key_here")  # Replace with your API key in production
+# Upload ingestion limits: bytes read, and pixels decoded (checked from the header first)
+IMAGE_UPLOAD_MAX_BYTES = int(os.getenv("IMAGE_UPLOAD_MAX_MB", "15")) * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS = int(os.getenv("IMAGE_UPLOAD_MAX_PIXELS", "40000000"))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Allowance for the multipart boundaries and the other form fields in an upload request
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadRejected(Exception):
+    """Raised when an upload is refused before decoding"""
+
+    def __init__(self, message: str, status_code: int, reason: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        IMAGE_UPLOADS_REJECTED_TOTAL.labels(reason).inc()
+
+# Coalesce identical concurrent upstream calls
+search_flight = SingleFlight("image_search")
+generate_flight = SingleFlight("image_generate")
+
+# Unsplash search settings
+UNSPLASH_SEARCH_COUNT = int(os.getenv("UNSPLASH_SEARCH_COUNT", "6"))
+UNSPLASH_FETCH_CONCURRENCY = int(os.getenv("UNSPLASH_FETCH_CONCURRENCY", "6"))
+UNSPLASH_IMAGE_HOSTS = {"images.unsplash.com", "plus.unsplash.com"}
+_fetch_semaphore = asyncio.Semaphore(UNSPLASH_FETCH_CONCURRENCY)
+
+# Batch placeholder resolution: concurrent lookups allowed per upstream
+RESOLVE_SEARCH_CONCURRENCY = int(os.getenv("RESOLVE_SEARCH_CONCURRENCY", "4"))
+RESOLVE_GENERATE_CONCURRENCY = int(os.getenv("RESOLVE_GENERATE_CONCURRENCY", "2"))
+_resolve_limits = {
+    "search": asyncio.Semaphore(RESOLVE_SEARCH_CONCURRENCY),
+    "generate": asyncio.Semaphore(RESOLVE_GENERATE_CONCURRENCY),
+}
+
+# Unsplash query -> result metadata, and image URL -> content hash of its re-encoded bytes
+unsplash_cache = ResponseCache(
+    name="unsplash",
+    db_path=os.path.join(CACHE_DIR, "unsplash_cache.sqlite3"),
+    ttl_seconds=float(os.getenv("UNSPLASH_CACHE_TTL", "86400")),
+    max_memory_entries=int(os.getenv("UNSPLASH_CACHE_MEMORY_ENTRIES", "1024")),
+    max_disk_entries=int(os.getenv("UNSPLASH_CACHE_DISK_ENTRIES", "20000"))
+)
 
 async def process_uploaded_image(file: UploadFile, placeholder_id: str) -> Dict[str, Any]:
     """
@@ -25,42 +85,116 @@ async def process_uploaded_image(file: UploadFile, placeholder_id: str) -> Dict[
         
     Returns:
         Dictionary with base64 encoded image and placeholder ID
+        
+    Raises:
+        UploadRejected: If the upload is too large, not an image, or over the pixel budget
     """
-    # Read and process the image
-    content = await file.read()
+    # Read the upload within the byte limit, then check its dimensions before decoding
+    content = await _read_upload(file)
+    _check_pixel_budget(content)
     
-    # Resize if necessary
-    content = resize_image(content, max_width=500, max_height=500)
+    # Resize and re-encode for the content, off the event loop
+    content, mime_type = await image_pool.run(
+        optimize_image, content, max_width=500, max_height=500, label="optimize_upload"
+    )
     
     # Convert to base64
     img_str = base64.b64encode(content).decode()
     
-    app_logger.info(f"Processed uploaded image for placeholder {placeholder_id}")
+    app_logger.info(f"Processed uploaded image for placeholder {placeholder_id} ({mime_type}, {len(content)} bytes)")
     
     return {
-        "image_data": f"data:image/png;base64,{img_str}",
+        "image_data": f"data:{mime_type};base64,{img_str}",
         "placeholder_id": placeholder_id
     }
 
+def check_upload_length(content_length: Optional[str]) -> None:
+    """
+    Refuse an upload request from its Content-Length header, before the body is read
+    
+    Starlette spools the whole multipart body while parsing the form, so this
+    is the check that bounds how much an upload can make the server ingest.
+    
+    Args:
+        content_length: The request's Content-Length header, if any
+        
+    Raises:
+        UploadRejected: If the length is missing, invalid or over the upload limit
+    """
+    if content_length is None or not content_length.isdigit():
+        raise UploadRejected("Upload requests must declare a Content-Length", 411, "no_length")
+    if int(content_length) > IMAGE_UPLOAD_MAX_BYTES + UPLOAD_FORM_OVERHEAD_BYTES:
+        limit_mb = IMAGE_UPLOAD_MAX_BYTES // (1024 * 1024)
+        raise UploadRejected(f"Image exceeds the {limit_mb} MB upload limit", 413, "too_large")
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """
+    Read an upload in chunks, stopping as soon as it is not an image or exceeds the byte limit
+    
+    The file is already spooled by the time it is read; the request size is
+    bounded by check_upload_length, and this cap is a second line of defence.
+    
+    Returns:
+        The upload's bytes
+    """
+    limit_mb = IMAGE_UPLOAD_MAX_BYTES // (1024 * 1024)
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        if not chunks and sniff_image_type(chunk) is None:
+            raise UploadRejected("Unsupported image format, expected PNG, JPEG, GIF or WebP", 415, "bad_type")
+        total += len(chunk)
+        if total > IMAGE_UPLOAD_MAX_BYTES:
+            raise UploadRejected(f"Image exceeds the {limit_mb} MB upload limit", 413, "too_large")
+        chunks.append(chunk)
+    
+    if not chunks:
+        raise UploadRejected("Uploaded file is empty", 400, "empty")
+    IMAGE_UPLOAD_BYTES.observe(total)
+    return b"".join(chunks)
+
+def _check_pixel_budget(content: bytes) -> None:
+    """Reject images whose header dimensions exceed the pixel budget, before any decode"""
+    try:
+        width, height = read_image_size(content)
+    except Image.DecompressionBombError:
+        raise UploadRejected("Image dimensions are too large", 413, "too_many_pixels")
+    except (UnidentifiedImageError, OSError, ValueError):
+        raise UploadRejected("Uploaded file is not a valid image", 400, "invalid")
+    
+    if width * height > IMAGE_UPLOAD_MAX_PIXELS:
+        raise UploadRejected(
+            f"Image is {width}x{height}, over the {IMAGE_UPLOAD_MAX_PIXELS // 1_000_000} megapixel limit",
+            413,
+            "too_many_pixels"
+        )
+    IMAGE_UPLOAD_PIXELS.observe(width * height)
+
 async def search_image(
     query: str, 
     placeholder_id: str, 
+    count: int = UNSPLASH_SEARCH_COUNT,
     timeout: float = 10.0
-) -> Dict[str, str]:
+) -> List[Dict[str, Any]]:
     """
-    Search for an image based on a text query using Unsplash API
+    Search for images based on a text query using Unsplash API
     
     Args:
         query: The search query
         placeholder_id: The ID of the placeholder to replace
-        timeout: Timeout in seconds for the API request (default: 10.0)
+        count: Number of candidates to return
+        timeout: Timeout in seconds for each API request (default: 10.0)
         
     Returns:
-        Dictionary with format: {"image_data": str, "placeholder_id": str}
+        List of dictionaries with a thumbnail data URL ("image_data"), the
+        placeholder ID, and the full-size URL to pass to select_image; a single
+        drawn placeholder marked "fallback" if the search is unavailable
         
     Raises:
-        TimeoutError: If the API request exceeds the timeout
-        ValueError: If invalid parameters are provided or no images found
+        ValueError: If invalid parameters are provided
     """
     # Input validation
     if not query or not query.strip():
@@ -70,94 +204,229 @@ async def search_image(
     api_key = os.environ.get("UNSPLASH_API_KEY", None)
     if not api_key:
         app_logger.error("Unsplash API key not found in environment variables")
+        FALLBACK_PLACEHOLDERS_TOTAL.labels("search_no_api_key").inc()
         # Fallback to a placeholder image
-        img_data = create_placeholder_image(
+        img_data = await image_pool.run(
+            create_placeholder_image,
             width=400, 
             height=400,
             text=f"No API Key\n(Placeholder)",
-            bg_color=(200, 100, 100)
+            bg_color=(200, 100, 100),
+            label="placeholder"
         )
-        return {
+        return [{
             "image_data": img_data,
-            "placeholder_id": placeholder_id
-        }
+            "placeholder_id": placeholder_id,
+            "fallback": True
+        }]
     
     # Log the search operation
-    app_logger.info(f"Searching Unsplash for '{query}' with placeholder ID: {placeholder_id}")
+    app_logger.info(f"Searching Unsplash for '{query}' ({count} results) with placeholder ID: {placeholder_id}")
     
     try:
-        # Perform the API request to Unsplash
-        encoded_query = quote_plus(query)
-        url = f"https://api.unsplash.com/search/photos?query={encoded_query}&per_page=1"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url, 
-                headers={"Authorization": f"Client-ID {api_key}"},
-                timeout=timeout
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    app_logger.error(f"Unsplash API error: {response.status} - {error_text}")
-                    raise ValueError(f"API returned status code {response.status}")
-                
-                data = await response.json()
-                
-                # Get the first result
-                results = data.get("results", [])
-                if not results:
-                    app_logger.warning(f"No image results found for query: {query}")
-                    raise ValueError(f"No images found for query: {query}")
-                
-                img_data = results[0]
-                img_url = img_data.get("urls", {}).get("small")
-                if not img_url:
-                    raise ValueError("Invalid image data received from API")
-                
-                # Download the image
-                async with session.get(img_url, timeout=timeout) as img_response:
-                    if img_response.status != 200:
-                        app_logger.warning(f"Failed to download image")
-                        raise ValueError("Failed to download image")
-                    
-                    img_bytes = await img_response.read()
-                    
-                    # Open and encode the image
-                    img = Image.open(io.BytesIO(img_bytes))
-                    buffered = io.BytesIO()
-                    img.save(buffered, format="JPEG")
-                    img_base64 = base64.b64encode(buffered.getvalue()).decode()
-                    
-                    # Log attribution info (since we're not returning it)
-                    photographer = img_data.get("user", {}).get("name", "Unknown")
-                    unsplash_link = img_data.get("links", {}).get("html", "")
-                    app_logger.info(f"Image by {photographer} from Unsplash: {unsplash_link}")
-                    
-                    # Return a single dictionary
-                    return {
-                        "image_data": f"data:image/jpeg;base64,{img_base64}",
-                        "placeholder_id": placeholder_id
-                    }
-                
+        # Identical concurrent searches share one upstream request
+        candidates = await search_flight.do(
+            f"{normalize_key(query)}|{count}",
+            lambda: _timed_unsplash_search(query, count, api_key, timeout)
+        )
+        if candidates:
+            return [{**candidate, "placeholder_id": placeholder_id} for candidate in candidates]
+        app_logger.warning(f"No image thumbnails could be fetched for query: {query}")
     except asyncio.TimeoutError:
         app_logger.error(f"Unsplash API request timed out for query: {query}")
+        ERRORS_TOTAL.labels("image_search").inc()
     except Exception as e:
         app_logger.error(f"Error during Unsplash image search: {str(e)}")
+        ERRORS_TOTAL.labels("image_search").inc()
     
     # Fallback to a placeholder image if search fails
-    img_data = create_placeholder_image(
+    FALLBACK_PLACEHOLDERS_TOTAL.labels("search_failed").inc()
+    img_data = await image_pool.run(
+        create_placeholder_image,
         width=400, 
         height=400,
         text=f"Image Search\n(Failed)",
-        bg_color=(200, 150, 100)
+        bg_color=(200, 150, 100),
+        label="placeholder"
     )
     
-    return {
+    return [{
         "image_data": img_data,
+        "placeholder_id": placeholder_id,
+        "fallback": True
+    }]
+
+async def select_image(image_url: str, placeholder_id: str, timeout: float = 10.0) -> Dict[str, str]:
+    """
+    Fetch the full-size rendition of a search result the user picked
+    
+    Args:
+        image_url: full_image_url of a search result
+        placeholder_id: The ID of the placeholder to replace
+        timeout: Timeout in seconds for the download (default: 10.0)
+        
+    Returns:
+        Dictionary with format: {"image_data": str, "placeholder_id": str}
+        
+    Raises:
+        ValueError: If the URL is not an Unsplash image URL or the download fails
+    """
+    # Only fetch from the Unsplash image CDN, never arbitrary URLs
+    parsed = urlparse(image_url)
+    if parsed.scheme != "https" or parsed.hostname not in UNSPLASH_IMAGE_HOSTS:
+        raise ValueError("Only Unsplash image URLs can be selected")
+    
+    jpeg_bytes = await _cached_unsplash_image(
+        get_http_session(), image_url, aiohttp.ClientTimeout(total=timeout)
+    )
+    img_base64 = base64.b64encode(jpeg_bytes).decode()
+    return {
+        "image_data": f"data:image/jpeg;base64,{img_base64}",
         "placeholder_id": placeholder_id
     }
 
-def generate_image(prompt: str, placeholder_id: str) -> Dict[str, Any]:
+async def _timed_unsplash_search(query: str, count: int, api_key: str, timeout: float) -> List[Dict[str, Any]]:
+    """Run _fetch_unsplash_candidates and record its latency"""
+    with UNSPLASH_FETCH_SECONDS.time():
+        return await _fetch_unsplash_candidates(query, count, api_key, timeout)
+
+async def _fetch_unsplash_candidates(query: str, count: int, api_key: str, timeout: float) -> List[Dict[str, Any]]:
+    """
+    Search Unsplash and fetch thumbnails of the results, using the search and image caches
+    
+    Args:
+        query: The search query
+        count: Number of results to request
+        api_key: Unsplash access key
+        timeout: Timeout in seconds for each request
+        
+    Returns:
+        Candidates with thumbnail data URLs, in Unsplash's ranking order;
+        results whose thumbnail could not be fetched are left out
+        
+    Raises:
+        ValueError: If the API fails or no images are found
+    """
+    session = get_http_session()
+    request_timeout = aiohttp.ClientTimeout(total=timeout)
+    
+    search_key = make_cache_key("search", normalize_key(query), count)
+    photos = await unsplash_cache.aget(search_key)
+    if photos is None:
+        photos = await _search_unsplash(session, query, count, api_key, request_timeout)
+        await unsplash_cache.aset(search_key, photos)
+    
+    async def fetch_thumb(photo: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        try:
+            async with _fetch_semaphore:
+                jpeg_bytes = await _cached_unsplash_image(session, photo["thumb_url"], request_timeout)
+        except Exception as e:
+            app_logger.warning(f"Failed to fetch thumbnail {photo['thumb_url']}: {str(e)}")
+            return None
+        img_base64 = base64.b64encode(jpeg_bytes).decode()
+        return {
+            "image_data": f"data:image/jpeg;base64,{img_base64}",
+            "description": photo["description"],
+            "full_image_url": photo["url"],
+            "photographer": photo["photographer"],
+            "attribution_url": photo["link"],
+        }
+    
+    # Thumbnails download concurrently, bounded by the fetch semaphore
+    thumbs = await asyncio.gather(*(fetch_thumb(photo) for photo in photos))
+    return [thumb for thumb in thumbs if thumb is not None]
+
+async def _cached_unsplash_image(
+    session: aiohttp.ClientSession,
+    img_url: str,
+    request_timeout: aiohttp.ClientTimeout
+) -> bytes:
+    """Return the re-encoded JPEG for an image URL, downloading it only on a cache miss"""
+    url_key = make_cache_key("image_url", img_url)
+    content_hash = await unsplash_cache.aget(url_key)
+    # The image store reads and writes files, so keep it off the event loop
+    jpeg_bytes = await asyncio.to_thread(image_store.get, content_hash) if content_hash else None
+    if jpeg_bytes is None:
+        jpeg_bytes = await _download_unsplash_image(session, img_url, request_timeout)
+        content_hash = await asyncio.to_thread(store_image, jpeg_bytes)
+        await unsplash_cache.aset(url_key, content_hash)
+    return jpeg_bytes
+
+async def _search_unsplash(
+    session: aiohttp.ClientSession,
+    query: str,
+    count: int,
+    api_key: str,
+    request_timeout: aiohttp.ClientTimeout
+) -> List[Dict[str, str]]:
+    """
+    Search Unsplash and return metadata for the top results
+    
+    Returns:
+        List of dictionaries with thumbnail and full-size URLs, description,
+        photographer and Unsplash page link
+    """
+    # Perform the API request to Unsplash over the shared, pooled session
+    encoded_query = quote_plus(query)
+    url = f"https://api.unsplash.com/search/photos?query={encoded_query}&per_page={count}"
+    
+    async with session.get(
+        url, 
+        headers={"Authorization": f"Client-ID {api_key}"},
+        timeout=request_timeout
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            app_logger.error(f"Unsplash API error: {response.status} - {error_text}")
+            raise ValueError(f"API returned status code {response.status}")
+        
+        data = await response.json()
+    
+    results = data.get("results", [])
+    if not results:
+        app_logger.warning(f"No image results found for query: {query}")
+        raise ValueError(f"No images found for query: {query}")
+    
+    photos = []
+    for img_data in results[:count]:
+        urls = img_data.get("urls", {})
+        thumb_url = urls.get("thumb") or urls.get("small")
+        full_url = urls.get("regular") or urls.get("small")
+        if not thumb_url or not full_url:
+            continue
+        photos.append({
+            "thumb_url": thumb_url,
+            "url": full_url,
+            "description": img_data.get("alt_description") or img_data.get("description") or "",
+            "photographer": img_data.get("user", {}).get("name", "Unknown"),
+            "link": img_data.get("links", {}).get("html", ""),
+        })
+    if not photos:
+        raise ValueError("Invalid image data received from API")
+    return photos
+
+async def _download_unsplash_image(
+    session: aiohttp.ClientSession,
+    img_url: str,
+    request_timeout: aiohttp.ClientTimeout
+) -> bytes:
+    """
+    Download an Unsplash image and re-encode it as JPEG
+    
+    Returns:
+        JPEG bytes
+    """
+    async with session.get(img_url, timeout=request_timeout) as img_response:
+        if img_response.status != 200:
+            app_logger.warning(f"Failed to download image")
+            raise ValueError("Failed to download image")
+        
+        img_bytes = await img_response.read()
+    
+    # Re-encode the image off the event loop
+    return await image_pool.run(reencode_jpeg, img_bytes, label="reencode_unsplash")
+
+async def generate_image(prompt: str, placeholder_id: str) -> Dict[str, Any]:
     """
     Generate an image from a text prompt using Gemini API
     
@@ -166,43 +435,136 @@ def generate_image(prompt: str, placeholder_id: str) -> Dict[str, Any]:
         placeholder_id: The ID of the placeholder to replace
         
     Returns:
-        Dictionary with base64 encoded image and placeholder ID
+        Dictionary with base64 encoded image and placeholder ID, marked
+        "fallback" if a placeholder was drawn instead
     """
     app_logger.info(f"Generating image with prompt '{prompt}' for placeholder {placeholder_id}")
     
     try:
-        client = genai.Client(api_key=API_KEY)
-        response = client.models.generate_images(
-            model="imagen-3.0-generate-002",
-            prompt=prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-            )
+        # Identical concurrent prompts share one upstream generation
+        img_data = await generate_flight.do(
+            normalize_key(prompt),
+            lambda: _generate_image_data(prompt)
         )
-        
-        # Get the generated image and convert to base64
-        generated_image = response.generated_images[0]
-        img_bytes = generated_image.image.image_bytes
-        img_str = base64.b64encode(img_bytes).decode()
-        
         return {
-            "image_data": f"data:image/png;base64,{img_str}",
+            "image_data": img_data,
             "placeholder_id": placeholder_id
         }
     except Exception as e:
         app_logger.error(f"Error generating image: {str(e)}")
+        ERRORS_TOTAL.labels("image_generation").inc()
+        FALLBACK_PLACEHOLDERS_TOTAL.labels("generation_failed").inc()
         # Fallback to a placeholder image if generation fails
-        img_data = create_placeholder_image(
+        img_data = await image_pool.run(
+            create_placeholder_image,
             width=400, 
             height=400,
             text=f"Generated Image\n(Placeholder)",
-            bg_color=(100, 150, 200)
+            bg_color=(100, 150, 200),
+            label="placeholder"
         )
         
         return {
             "image_data": img_data,
-            "placeholder_id": placeholder_id
+            "placeholder_id": placeholder_id,
+            "fallback": True
         }
+
+async def resolve_placeholders(
+    placeholders: Dict[str, str],
+    strategies: Optional[Dict[str, str]] = None,
+    default_strategy: str = "search"
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Resolve several image placeholders concurrently, yielding each result as it completes
+    
+    Searches take the best Unsplash match at full size, generations go to
+    Gemini, and "placeholder" draws a labelled placeholder. Each upstream has
+    its own concurrency limit, so the batch finishes in about the time of the
+    slowest lookup rather than the sum of all of them.
+    
+    Args:
+        placeholders: Placeholder ID -> alt text
+        strategies: Placeholder ID -> "search", "generate" or "placeholder"
+        default_strategy: Strategy for placeholders missing from strategies
+        
+    Yields:
+        {"placeholder_id", "strategy", "image_data", "fallback"} (fallback is
+        set for drawn placeholders), or "error" instead of "image_data" and
+        "fallback" if the lookup failed
+    """
+    strategies = strategies or {}
+    
+    async def resolve(placeholder_id: str, alt_text: str) -> Dict[str, Any]:
+        strategy = strategies.get(placeholder_id, default_strategy)
+        description = alt_text.strip() or placeholder_id
+        try:
+            if strategy == "search":
+                async with _resolve_limits["search"]:
+                    result = (await search_image(description, placeholder_id, count=1))[0]
+                    if result.get("full_image_url"):
+                        try:
+                            result = await select_image(result["full_image_url"], placeholder_id)
+                        except Exception as e:
+                            # Keep the thumbnail rather than failing the placeholder
+                            app_logger.warning(f"Using thumbnail for placeholder {placeholder_id}: {str(e)}")
+            elif strategy == "generate":
+                async with _resolve_limits["generate"]:
+                    result = await generate_image(description, placeholder_id)
+            else:
+                image_data = await image_pool.run(
+                    create_placeholder_image,
+                    width=400,
+                    height=400,
+                    text=description[:40],
+                    label="placeholder"
+                )
+                result = {"image_data": image_data, "fallback": True}
+            return {
+                "placeholder_id": placeholder_id,
+                "strategy": strategy,
+                "image_data": result["image_data"],
+                "fallback": result.get("fallback", False)
+            }
+        except Exception as e:
+            app_logger.error(f"Error resolving placeholder {placeholder_id}: {str(e)}")
+            ERRORS_TOTAL.labels("image_resolve").inc()
+            return {"placeholder_id": placeholder_id, "strategy": strategy, "error": str(e)}
+    
+    tasks = [asyncio.create_task(resolve(pid, alt)) for pid, alt in placeholders.items()]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # The client may disconnect mid-stream; stop the remaining lookups
+        for task in tasks:
+            task.cancel()
+
+async def _generate_image_data(prompt: str) -> str:
+    """
+    Generate one image with Imagen
+    
+    Args:
+        prompt: The text prompt for image generation
+        
+    Returns:
+        Base64 encoded PNG data URL
+    """
+    async with gemini_slot() as client:
+        with GEMINI_LATENCY.labels("generate_images").time():
+            response = await client.models.generate_images(
+                model="imagen-3.0-generate-002",
+                prompt=prompt,
+                config=types.GenerateImagesConfig(
+                    number_of_images=1,
+                )
+            )
+    
+    # Get the generated image and convert to base64
+    generated_image = response.generated_images[0]
+    img_bytes = generated_image.image.image_bytes
+    img_str = base64.b64encode(img_bytes).decode()
+    return f"data:image/png;base64,{img_str}"
     
 # Test the image service functions
 if __name__ == "__main__":
@@ -222,16 +584,16 @@ if __name__ == "__main__":
     # Test search_image
     async def test_search_image():
         # Run the test
-        result = await search_image("cat", "cat")
-        print(result)
+        results = await search_image("cat", "cat", count=3)
+        print([result.get("full_image_url") for result in results])
     
     # Test generate_image
-    def test_generate_image():
+    async def test_generate_image():
         # Run the test
-        result = generate_image("A beautiful sunset over the ocean", "sunset")
+        result = await generate_image("A beautiful sunset over the ocean", "sunset")
         print(result)
     
     # Run the tests
     asyncio.run(test_process_uploaded_image())
     asyncio.run(test_search_image())
-    test_generate_image()
\ No newline at end of file
+    asyncio.run(test_generate_image())
\ No newline at end of file
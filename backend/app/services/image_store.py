@@ -0,0 +1,106 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+from typing import Optional
+from app.utils.blob_store import BlobStore
+from app.utils.cache import CACHE_DIR
+from app.utils.html_tree import DATA_URI_PATTERN
+
+# Route that serves stored images, mounted under the /api/image router
+IMAGE_BLOB_PATH = "/api/image/blob/"
+
+# Absolute or root-relative blob URLs; the host is ignored since the hash names the content
+_BLOB_URL_PATTERN = re.compile(r"^(?:https?://[^/\s]+)?/api/image/blob/([0-9a-f]{64})$")
+
+# Image bytes keyed by their SHA-256, shared by the API and the render workers.
+# Disposable cache (downloaded Unsplash images): bounded, least recently used first out
+image_store = BlobStore(
+    "images",
+    directory=os.path.join(CACHE_DIR, "images"),
+    max_memory_bytes=int(os.getenv("IMAGE_CACHE_MEMORY_MB", "32")) * 1024 * 1024,
+    max_disk_bytes=int(os.getenv("IMAGE_CACHE_DISK_MB", "256")) * 1024 * 1024
+)
+
+# Images placed in a resume (uploads, selected and generated images) and referenced by URL.
+# Kept apart from the cache so search traffic cannot evict them; every view or export of a
+# resume reads its images and marks them as used, so only images left unused for a long
+# time are evicted once the store is full
+upload_store = BlobStore(
+    "image_uploads",
+    directory=os.getenv("IMAGE_UPLOAD_DIR", os.path.join(CACHE_DIR, "uploads")),
+    max_memory_bytes=int(os.getenv("IMAGE_CACHE_MEMORY_MB", "32")) * 1024 * 1024,
+    max_disk_bytes=int(os.getenv("IMAGE_UPLOAD_DISK_MB", "2048")) * 1024 * 1024
+)
+
+
+def store_image(image_data: bytes, pinned: bool = False) -> str:
+    """
+    Add image bytes to the store
+
+    Args:
+        image_data: Encoded image
+        pinned: Keep the image with the images placed in resumes rather than in the cache
+
+    Returns:
+        The SHA-256 hex digest that addresses the image
+    """
+    content_hash = hashlib.sha256(image_data).hexdigest()
+    store = upload_store if pinned else image_store
+    if not store.contains(content_hash):
+        store.set(content_hash, image_data)
+    return content_hash
+
+
+def get_image(content_hash: str) -> Optional[bytes]:
+    """Read a stored image, from the pinned uploads first and then the cache"""
+    return upload_store.get(content_hash) or image_store.get(content_hash)
+
+
+def store_data_uri(data_uri: str, pinned: bool = True) -> Optional[str]:
+    """
+    Move a base64 data URI into the store
+
+    Args:
+        data_uri: data:image/...;base64,... URI
+        pinned: Store with the images placed in resumes (see store_image)
+
+    Returns:
+        The content hash, or None if the value is not a base64 image data URI
+    """
+    match = DATA_URI_PATTERN.match(data_uri)
+    if not match:
+        return None
+    try:
+        return store_image(base64.b64decode(match.group(1), validate=False), pinned)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def blob_hash(url: str) -> Optional[str]:
+    """Return the content hash a blob URL points at, or None for other URLs"""
+    match = _BLOB_URL_PATTERN.match(url.strip())
+    return match.group(1) if match else None
+
+
+def load_blob_url(url: str) -> Optional[bytes]:
+    """
+    Read the image behind a blob URL from the local store, without an HTTP request
+
+    Args:
+        url: Image URL from the resume HTML
+
+    Returns:
+        The image bytes, or None if the URL is not a blob URL or the blob is gone
+    """
+    content_hash = blob_hash(url)
+    return get_image(content_hash) if content_hash else None
+
+
+if __name__ == "__main__":
+    # Test storing and resolving an image
+    content_hash = store_image(b"\x89PNG\r\n\x1a\n test", pinned=True)
+    url = f"http://localhost:8000{IMAGE_BLOB_PATH}{content_hash}"
+    print("URL:", url)
+    print("Resolved:", load_blob_url(url))
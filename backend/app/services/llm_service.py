@@ -1,23 +1,86 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, List, Literal, Optional, Tuple
+import asyncio
 import os
-from google import genai
+import time
 from google.genai import types
-from app.utils.markdown_helpers import extract_html_from_markdown, extract_image_placeholders
-from app.utils.templates import DEFAULT_RESUME_HTML, GENERATE_PROMPT_TEMPLATE
+from app.services.gemini_client import gemini_slot
+from app.utils.markdown_helpers import (
+    HtmlStreamExtractor,
+    extract_html_from_markdown,
+    extract_image_placeholders,
+    find_html_end
+)
+from app.utils.html_sections import (
+    extract_body_html,
+    find_affected_sections,
+    split_document_shell,
+    split_resume_sections,
+    splice_sections
+)
+from app.utils.templates import (
+    COMPACT_GENERATE_PROMPT_TEMPLATE,
+    DEFAULT_RESUME_HTML,
+    DEFAULT_RESUME_SKELETON,
+    GENERATE_PROMPT_TEMPLATE,
+    RESUME_DOCUMENT_PREFIX,
+    RESUME_DOCUMENT_SUFFIX,
+    SECTION_UPDATE_PROMPT_TEMPLATE
+)
 from app.utils.logger import app_logger
+from app.utils.cache import CACHE_DIR, ResponseCache, make_cache_key
+from app.utils.singleflight import SingleFlight
+from app.utils.metrics import (
+    ERRORS_TOTAL,
+    GEMINI_LATENCY,
+    GEMINI_OUTPUT_TOKENS,
+    GEMINI_PROMPT_TOKENS,
+    GEMINI_STREAM_OUTCOMES_TOTAL
+)
 
-# 初始化 Google Gemini API 客户端
-API_KEY = os.getenv("GEMINI_API_KEY", "")  # 在生产环境中替换为您的 API 密钥
+# 模型及生成参数
+MODEL_NAME = "gemini-2.0-flash"
+GENERATION_CONFIG = {
+    "temperature": 0.2
+}
 
-def generate_resume_content(
+# 输出令牌预算：按提示词长度估算，限制在[最小值, 最大值]之间
+MIN_OUTPUT_TOKENS = int(os.getenv("RESUME_MIN_OUTPUT_TOKENS", "1024"))
+MAX_OUTPUT_TOKENS = int(os.getenv("RESUME_MAX_OUTPUT_TOKENS", "8192"))
+OUTPUT_TOKEN_RATIO = float(os.getenv("RESUME_OUTPUT_TOKEN_RATIO", "1.2"))
+
+# 输出因长度限制被截断时，续写请求使用的提示
+CONTINUE_PROMPT = "上面的输出因长度限制被截断。请从中断处继续输出剩余内容，不要重复已输出的部分，也不要添加任何说明。"
+
+# 更新现有简历的方式：sections 只重新生成受影响的部分，full 整份重新生成
+UpdateMode = Literal["sections", "full"]
+UPDATE_MODES = ("sections", "full")
+UPDATE_MODE = os.getenv("RESUME_UPDATE_MODE", "sections")
+
+# 精简提示词：不把样式表发给模型，由服务端在结果中注入
+COMPACT_PROMPT = os.getenv("RESUME_COMPACT_PROMPT", "true").lower() in ("1", "true", "yes")
+
+# 生成结果缓存：键为最终提示词、模型和生成参数的哈希
+resume_cache = ResponseCache(
+    name="resume",
+    db_path=os.path.join(CACHE_DIR, "resume_cache.sqlite3"),
+    ttl_seconds=float(os.getenv("RESUME_CACHE_TTL", "86400")),
+    max_memory_entries=int(os.getenv("RESUME_CACHE_MEMORY_ENTRIES", "256")),
+    max_disk_entries=int(os.getenv("RESUME_CACHE_DISK_ENTRIES", "5000"))
+)
+
+# 合并并发的相同生成请求
+resume_flight = SingleFlight("resume")
+
+def _build_prompt(
     name: str,
     position: str,
     additional_info: Dict[str, Any] = None,
     existing_content: Optional[str] = None,
-    update_instructions: Optional[str] = None
-) -> Dict[str, Any]:
+    update_instructions: Optional[str] = None,
+    compact: bool = False
+) -> Tuple[str, Optional[Tuple[str, str]]]:
     """
-    使用Google Gemini API生成简历内容
+    根据用户输入构建发送给模型的最终提示词
     
     Args:
         name: 用户姓名
@@ -25,12 +88,12 @@ def generate_resume_content(
         additional_info: 额外的简历信息
         existing_content: 要更新的现有HTML内容
         update_instructions: 更新现有内容的具体指示
+        compact: 是否使用精简提示词（不发送样式表，只让模型输出<body>内容）
         
     Returns:
-        包含HTML内容和图片占位符的字典
+        (提示词文本, 文档外壳)。文档外壳为 (前缀, 后缀)，用于把模型输出的
+        <body>内容重新包装为完整文档；不需要包装时为None
     """
-    app_logger.info(f"为 {name} 生成简历，职位: {position}")
-    
     additional_info_str = ""
     if additional_info:
         for key, value in additional_info.items():
@@ -40,6 +103,16 @@ def generate_resume_content(
     if existing_content:
         # 如果更新现有内容，使用不同的提示
         app_logger.info("更新现有简历内容")
+        shell = None
+        output_format = "提供更新后的完整HTML格式简历。保留现有图片占位符。"
+        if compact:
+            # 只发送<body>内容，原有的<head>和样式表在本地保留
+            parts = split_document_shell(existing_content)
+            if parts:
+                prefix, existing_content, suffix = parts
+                shell = (prefix, suffix)
+                output_format = "只输出更新后的<body>标签内部的HTML，用```html代码块包裹。保留现有图片占位符。"
+        
         prompt = f"""
         <背景>
         您是一位专业简历撰写AI助手，精通更新专业简历。您专门为中国求职市场服务，了解中国雇主的喜好和期望。
@@ -69,52 +142,463 @@ def generate_resume_content(
         </更新要求>
 
         <输出格式>
-        提供更新后的完整HTML格式简历。保留现有图片占位符。
+        {output_format}
         </输出格式>
         """
-    else:
-        # 创建新简历
-        app_logger.info("创建新简历内容")
-        prompt = GENERATE_PROMPT_TEMPLATE.format(
+        return prompt, shell
+    
+    # 创建新简历
+    app_logger.info("创建新简历内容")
+    if compact:
+        prompt = COMPACT_GENERATE_PROMPT_TEMPLATE.format(
             name=name,
             position=position,
             additional_info=additional_info_str,
-            default_html_template=DEFAULT_RESUME_HTML
+            default_html_template=DEFAULT_RESUME_SKELETON
         )
+        return prompt, (RESUME_DOCUMENT_PREFIX, RESUME_DOCUMENT_SUFFIX)
     
-    try:
-        # 使用Gemini生成内容
-        client = genai.Client(api_key=API_KEY)
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
+    prompt = GENERATE_PROMPT_TEMPLATE.format(
+        name=name,
+        position=position,
+        additional_info=additional_info_str,
+        default_html_template=DEFAULT_RESUME_HTML
+    )
+    return prompt, None
+
+
+def _build_result(raw_text: str) -> Dict[str, Any]:
+    """
+    从模型原始输出中提取HTML和图片占位符
+    
+    Args:
+        raw_text: 模型返回的原始文本
+        
+    Returns:
+        包含HTML内容和图片占位符的字典
+    """
+    # 处理响应文本，以防它包含markdown格式
+    html_content = extract_html_from_markdown(raw_text)
+    
+    # 提取图片占位符
+    image_placeholders = extract_image_placeholders(html_content)
+    
+    app_logger.info(f"简历生成成功，包含 {len(image_placeholders)} 个图片占位符")
+    
+    return {
+        "html_content": html_content,
+        "image_placeholders": image_placeholders
+    }
+
+
+def _wrap_document(html_content: str, shell: Optional[Tuple[str, str]]) -> str:
+    """用文档外壳（含样式表）把<body>内容包装为完整HTML文档"""
+    if shell is None:
+        return html_content
+    body = extract_body_html(html_content).strip()
+    return f"{shell[0]}\n{body}\n{shell[1]}"
+
+
+def _build_usage(usage_metadata: Any = None) -> Dict[str, Any]:
+    """把模型返回的 usage_metadata 转为令牌用量字典，缓存命中时用量为0"""
+    return {
+        "prompt_tokens": getattr(usage_metadata, "prompt_token_count", None) or 0,
+        "output_tokens": getattr(usage_metadata, "candidates_token_count", None) or 0,
+        "cached": usage_metadata is None,
+        "partial": False
+    }
+
+
+def _record_usage(operation: str, usage: Dict[str, Any]) -> None:
+    """记录一次实际模型调用的令牌用量指标"""
+    GEMINI_PROMPT_TOKENS.labels(operation).observe(usage["prompt_tokens"])
+    GEMINI_OUTPUT_TOKENS.labels(operation).observe(usage["output_tokens"])
+
+
+def _merge_usage(usages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """合并多次模型调用的令牌用量"""
+    return {
+        "prompt_tokens": sum(usage["prompt_tokens"] for usage in usages),
+        "output_tokens": sum(usage["output_tokens"] for usage in usages),
+        "cached": all(usage["cached"] for usage in usages),
+        "partial": any(usage.get("partial") for usage in usages)
+    }
+
+
+def _estimate_tokens(text: str) -> int:
+    """粗略估算文本的令牌数（中文约每字一个令牌，HTML和英文约每四个字符一个令牌）"""
+    cjk = sum(1 for char in text if "\u4e00" <= char <= "\u9fff")
+    return cjk + (len(text) - cjk) // 4
+
+
+def _estimate_prompt_tokens(contents: Any) -> int:
+    """估算发送给模型的内容（提示词字符串或续写时的多轮内容）的令牌数"""
+    if isinstance(contents, str):
+        return _estimate_tokens(contents)
+    return sum(
+        _estimate_tokens(part.text or "")
+        for content in contents for part in (content.parts or [])
+    )
+
+
+def _output_budget(prompt: str) -> int:
+    """
+    根据提示词长度确定输出令牌预算
+
+    模型输出的HTML与提示词中的模板或现有内容规模相当，因此按提示词估算，
+    避免固定预算过大浪费或过小截断
+    """
+    budget = int(_estimate_tokens(prompt) * OUTPUT_TOKEN_RATIO)
+    return max(MIN_OUTPUT_TOKENS, min(MAX_OUTPUT_TOKENS, budget))
+
+
+def _build_usage_from_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """把 _stream_resume 累计的令牌数转为令牌用量字典"""
+    return {
+        "prompt_tokens": stats.get("prompt_tokens", 0),
+        "output_tokens": stats.get("output_tokens", 0),
+        "cached": False,
+        "partial": stats.get("partial", False)
+    }
+
+
+async def _stream_model(
+    contents: Any,
+    max_output_tokens: int,
+    received: str,
+    stats: Dict[str, Any]
+) -> AsyncIterator[str]:
+    """
+    流式调用模型，HTML结束（</html>或代码块结束标记）后立即关闭流
+    
+    完整的令牌用量只在最后一个分块中返回。提前结束时不再读取剩余分块（模型停止生成，
+    也不再为之后的说明文字计费），用量取已收到的分块中的值，缺失时按已收到的文本估算，
+    并在 stats["partial"] 中标记为不完整。
+    
+    Args:
+        contents: 发送给模型的内容
+        max_output_tokens: 输出令牌预算
+        received: 之前已收到的输出（续写时用于判断HTML是否结束）
+        stats: 用于累计令牌用量并记录是否提前结束、是否被截断
+        
+    Yields:
+        模型输出的文本片段
+    """
+    usage_metadata = None
+    finish_reason = None
+    generated = ""
+    async with gemini_slot() as client:
+        stream = await client.models.generate_content_stream(
+            model=MODEL_NAME,
+            contents=contents,
             config=types.GenerateContentConfig(
-                max_output_tokens=4000,
-                temperature=0.2
+                **GENERATION_CONFIG,
+                max_output_tokens=max_output_tokens
             )
         )
+        try:
+            async for chunk in stream:
+                usage_metadata = chunk.usage_metadata or usage_metadata
+                if chunk.candidates and chunk.candidates[0].finish_reason:
+                    finish_reason = chunk.candidates[0].finish_reason
+                
+                text = chunk.text or ""
+                html_end = find_html_end(received + text)
+                if html_end is not None:
+                    # HTML已经完整，关闭流，之后的说明文字不再生成
+                    text = text[:max(html_end - len(received), 0)]
+                    generated += text
+                    yield text
+                    stats["early_stop"] = True
+                    break
+                received += text
+                generated += text
+                yield text
+        finally:
+            if hasattr(stream, "aclose"):
+                await stream.aclose()
+    
+    usage = _build_usage(usage_metadata)
+    if stats.get("early_stop"):
+        # 最后一个分块没有收到：用已见到的用量，缺失的部分按已收到的内容估算
+        usage["prompt_tokens"] = usage["prompt_tokens"] or _estimate_prompt_tokens(contents)
+        usage["output_tokens"] = max(usage["output_tokens"], _estimate_tokens(generated))
+        stats["partial"] = True
+    stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + usage["prompt_tokens"]
+    stats["output_tokens"] = stats.get("output_tokens", 0) + usage["output_tokens"]
+    stats["truncated"] = (
+        not stats.get("early_stop") and finish_reason == types.FinishReason.MAX_TOKENS
+    )
+
+
+async def _stream_resume(prompt: str, operation: str, stats: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    按自适应预算流式生成，输出被截断时发起一次续写请求
+    
+    Args:
+        prompt: 最终提示词
+        operation: 指标中的操作名称
+        stats: 调用结束后包含 prompt_tokens 和 output_tokens
         
-        # 处理响应文本，以防它包含markdown格式
-        raw_text = response.text
-        html_content = extract_html_from_markdown(raw_text)
+    Yields:
+        模型输出的文本片段
+    """
+    started = time.perf_counter()
+    received = ""
+    async for text in _stream_model(prompt, _output_budget(prompt), received, stats):
+        received += text
+        yield text
+    
+    if stats["truncated"]:
+        app_logger.warning("模型输出被截断，发起续写请求")
+        GEMINI_STREAM_OUTCOMES_TOTAL.labels("continued").inc()
+        contents = [
+            types.Content(role="user", parts=[types.Part(text=prompt)]),
+            types.Content(role="model", parts=[types.Part(text=received)]),
+            types.Content(role="user", parts=[types.Part(text=CONTINUE_PROMPT)])
+        ]
+        async for text in _stream_model(contents, MAX_OUTPUT_TOKENS, received, stats):
+            yield text
+    
+    GEMINI_STREAM_OUTCOMES_TOTAL.labels(
+        "early_stop" if stats.get("early_stop") else "complete"
+    ).inc()
+    GEMINI_LATENCY.labels(operation).observe(time.perf_counter() - started)
+    _record_usage(operation, _build_usage_from_stats(stats))
+
+
+async def _generate(prompt: str) -> Dict[str, Any]:
+    """
+    调用模型生成内容，相同提示词直接返回缓存结果
+    
+    Args:
+        prompt: 最终提示词
         
-        # 提取图片占位符
-        image_placeholders = extract_image_placeholders(html_content)
+    Returns:
+        包含HTML内容、图片占位符和令牌用量的字典
+    """
+    cache_key = make_cache_key(prompt, MODEL_NAME, GENERATION_CONFIG)
+    cached = await resume_cache.aget(cache_key)
+    if cached is not None:
+        app_logger.info(f"命中简历缓存 {cache_key[:12]}，缓存统计: {resume_cache.stats}")
+        return {**cached, "usage": _build_usage()}
+    
+    async def call_model() -> Dict[str, Any]:
+        # 使用共享的Gemini客户端流式生成，HTML完整后即停止
+        stats: Dict[str, Any] = {}
+        parts = [text async for text in _stream_resume(prompt, "generate_content", stats)]
         
-        app_logger.info(f"简历生成成功，包含 {len(image_placeholders)} 个图片占位符")
+        result = _build_result("".join(parts))
+        await resume_cache.aset(cache_key, result)
+        return {**result, "usage": _build_usage_from_stats(stats)}
+    
+    # 并发的相同请求只调用一次模型，共享结果
+    result = await resume_flight.do(cache_key, call_model)
+    return dict(result)
+
+
+async def _update_sections(
+    name: str,
+    position: str,
+    additional_info: Dict[str, Any],
+    existing_content: str,
+    update_instructions: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    只重新生成受影响的简历部分，并在本地拼接回原HTML
+    
+    Args:
+        name: 用户姓名
+        position: 职位
+        additional_info: 额外的简历信息
+        existing_content: 要更新的现有HTML内容
+        update_instructions: 更新现有内容的具体指示
         
-        return {
-            "html_content": html_content,
-            "image_placeholders": image_placeholders
-        }
+    Returns:
+        包含HTML内容、图片占位符和令牌用量的字典；无法按部分更新时返回None
+    """
+    sections = split_resume_sections(existing_content)
+    if not sections:
+        return None
+    
+    affected = find_affected_sections(
+        sections, name, position, additional_info, update_instructions
+    )
+    if affected is None:
+        return None
+    
+    app_logger.info(f"按部分更新简历: {', '.join(affected)}")
+    
+    # 按部分下标而不是类型记录，替换时只改对应的那一个部分
+    section_prompts = {}
+    for index, section in enumerate(sections):
+        if section["key"] not in affected:
+            continue
+        fields = affected[section["key"]]
+        section_info = "".join(f"{field}: {additional_info[field]}\n" for field in fields)
+        section_prompts[index] = SECTION_UPDATE_PROMPT_TEMPLATE.format(
+            section_title=section["title"],
+            name=name,
+            position=position,
+            additional_info=section_info,
+            section_html=section["html"],
+            update_instructions=update_instructions or "保持现有排版和设计，更新内容。"
+        )
+    
+    # 各部分并发生成
+    indexes = list(section_prompts)
+    results = await asyncio.gather(*(_generate(section_prompts[index]) for index in indexes))
+    replacements = {index: result["html_content"] for index, result in zip(indexes, results)}
+    
+    html_content = splice_sections(existing_content, sections, replacements)
+    return {
+        "html_content": html_content,
+        "image_placeholders": extract_image_placeholders(html_content),
+        "usage": _merge_usage([result["usage"] for result in results])
+    }
+
+
+async def generate_resume_content(
+    name: str,
+    position: str,
+    additional_info: Dict[str, Any] = None,
+    existing_content: Optional[str] = None,
+    update_instructions: Optional[str] = None,
+    update_mode: UpdateMode = UPDATE_MODE,
+    compact: bool = COMPACT_PROMPT
+) -> Dict[str, Any]:
+    """
+    使用Google Gemini API生成简历内容
+    
+    Args:
+        name: 用户姓名
+        position: 职位
+        additional_info: 额外的简历信息
+        existing_content: 要更新的现有HTML内容
+        update_instructions: 更新现有内容的具体指示
+        update_mode: 更新方式，"sections" 只重新生成受影响的部分（无法拆分时退回整份），
+            "full" 整份重新生成
+        compact: 是否使用精简提示词，样式表由服务端注入而不经过模型
+        
+    Returns:
+        包含HTML内容、图片占位符和令牌用量的字典
+    """
+    if update_mode not in UPDATE_MODES:
+        raise ValueError(f"Unsupported update mode: {update_mode}")
+    
+    app_logger.info(f"为 {name} 生成简历，职位: {position}")
+    
+    try:
+        result = None
+        if existing_content and update_mode == "sections":
+            result = await _update_sections(
+                name, position, additional_info or {}, existing_content, update_instructions
+            )
+            if result is None:
+                app_logger.info("无法按部分更新，改为整份重新生成")
+        
+        if result is None:
+            prompt, shell = _build_prompt(
+                name, position, additional_info, existing_content, update_instructions, compact
+            )
+            result = await _generate(prompt)
+            result["html_content"] = _wrap_document(result["html_content"], shell)
+        
+        usage = result["usage"]
+        app_logger.info(
+            f"令牌用量: 输入 {usage['prompt_tokens']}，输出 {usage['output_tokens']}"
+            f"{'（缓存）' if usage['cached'] else ''}{'（部分为估算）' if usage.get('partial') else ''}"
+        )
+        return result
     except Exception as e:
+        ERRORS_TOTAL.labels("resume_generation").inc()
         app_logger.error(f"生成简历内容时出错: {str(e)}")
         raise
 
+
+async def generate_resume_content_stream(
+    name: str,
+    position: str,
+    additional_info: Dict[str, Any] = None,
+    existing_content: Optional[str] = None,
+    update_instructions: Optional[str] = None,
+    compact: bool = COMPACT_PROMPT
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    使用Gemini流式API生成简历内容，边生成边返回HTML片段
+    
+    Args:
+        name: 用户姓名
+        position: 职位
+        additional_info: 额外的简历信息
+        existing_content: 要更新的现有HTML内容
+        update_instructions: 更新现有内容的具体指示
+        compact: 是否使用精简提示词，样式表由服务端注入而不经过模型
+        
+    Yields:
+        事件字典：{"event": "chunk", "data": {"html": 片段}}，
+        最后一个为 {"event": "done", "data": 包含HTML内容、图片占位符和令牌用量的字典}
+    """
+    app_logger.info(f"为 {name} 流式生成简历，职位: {position}")
+    
+    prompt, shell = _build_prompt(
+        name, position, additional_info, existing_content, update_instructions, compact
+    )
+    
+    # 缓存命中时一次性返回完整内容
+    cache_key = make_cache_key(prompt, MODEL_NAME, GENERATION_CONFIG)
+    cached = await resume_cache.aget(cache_key)
+    if cached is not None:
+        app_logger.info(f"命中简历缓存 {cache_key[:12]}，缓存统计: {resume_cache.stats}")
+        html_content = _wrap_document(cached["html_content"], shell)
+        yield {"event": "chunk", "data": {"html": html_content}}
+        yield {
+            "event": "done",
+            "data": {**cached, "html_content": html_content, "usage": _build_usage()}
+        }
+        return
+    
+    try:
+        # 文档外壳（含样式表）不依赖模型输出，可以立即发送
+        if shell is not None:
+            yield {"event": "chunk", "data": {"html": shell[0]}}
+        
+        raw_parts = []
+        stats: Dict[str, Any] = {}
+        extractor = HtmlStreamExtractor()
+        async for text in _stream_resume(prompt, "generate_content_stream", stats):
+            raw_parts.append(text)
+            html_part = extractor.feed(text)
+            if html_part:
+                yield {"event": "chunk", "data": {"html": html_part}}
+        
+        html_part = extractor.finish()
+        if html_part:
+            yield {"event": "chunk", "data": {"html": html_part}}
+        if shell is not None:
+            yield {"event": "chunk", "data": {"html": shell[1]}}
+        
+        usage = _build_usage_from_stats(stats)
+        result = _build_result("".join(raw_parts))
+        await resume_cache.aset(cache_key, result)
+        yield {
+            "event": "done",
+            "data": {
+                **result,
+                "html_content": _wrap_document(result["html_content"], shell),
+                "usage": usage
+            }
+        }
+    except Exception as e:
+        ERRORS_TOTAL.labels("resume_generation").inc()
+        app_logger.error(f"流式生成简历内容时出错: {str(e)}")
+        raise
+
 if __name__ == "__main__":
+    
     # 测试简历生成功能
     print("测试生成新简历")
-    resume_content = generate_resume_content(
+    resume_content = asyncio.run(generate_resume_content(
         name="张三",
         position="数据分析师",
         additional_info={
@@ -123,13 +607,13 @@ if __name__ == "__main__":
             "所在地": "北京",
             "求职意向": "数据分析"
         }
-    )
+    ))
     print(resume_content["html_content"])
     print("图片占位符:", resume_content["image_placeholders"])
     
     # 测试更新功能
     print("\n测试更新现有简历")
-    updated_resume = generate_resume_content(
+    updated_resume = asyncio.run(generate_resume_content(
         name="张三",
         position="高级数据分析师",
         additional_info={
@@ -147,6 +631,6 @@ if __name__ == "__main__":
         },
         existing_content=resume_content["html_content"],
         update_instructions="请将简历排版顺序调整为：教育经历、专业技能、项目经历、工作经历、语言能力、证书与资质、兴趣爱好"
-    )
+    ))
     print(updated_resume["html_content"])
     print("图片占位符:", updated_resume["image_placeholders"])
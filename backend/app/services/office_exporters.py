@@ -0,0 +1,391 @@
+import base64
+import binascii
+import io
+import re
+from typing import Iterator, List, Optional, Set, Tuple
+from PIL import Image
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Inches as DocxInches, Pt as DocxPt
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from app.services.image_store import load_blob_url
+from app.utils.html_tree import (
+    BLOCK_TAGS,
+    DATA_URI_PATTERN,
+    DEFAULT_IMAGE_WIDTH,
+    HEADING_CLASSES,
+    Node,
+    collapse_whitespace,
+    find_body,
+    office_image_width,
+    parse_html
+)
+
+# Font used for CJK text in Office documents (matches the template's first choice)
+OFFICE_CJK_FONT = "SimSun"
+
+# Template classes rendered in italics (dates and job titles)
+EMPHASIS_CLASSES = {"education-date", "experience-date", "project-date", "job-title"}
+
+# A run of inline text: (text, bold, italic)
+Run = Tuple[str, bool, bool]
+
+
+class Block:
+    """
+    One block of exported content.
+
+    kind is one of "heading", "paragraph", "list_item", "table" or "image".
+    """
+
+    def __init__(self, kind: str, **fields):
+        self.kind = kind
+        self.level: int = fields.get("level", 0)
+        self.ordered: bool = fields.get("ordered", False)
+        self.runs: List[Run] = fields.get("runs", [])
+        self.rows: List[List[str]] = fields.get("rows", [])
+        self.image: Optional[bytes] = fields.get("image")
+        self.width_px: int = fields.get("width_px", DEFAULT_IMAGE_WIDTH)
+
+    @property
+    def text(self) -> str:
+        return "".join(text for text, _, _ in self.runs)
+
+
+def extract_blocks(html_content: str) -> List[Block]:
+    """
+    Flatten resume HTML into the blocks the Office exporters lay out
+
+    Args:
+        html_content: Resume HTML (full document or fragment)
+
+    Returns:
+        Blocks in document order
+    """
+    blocks: List[Block] = []
+    _walk(find_body(parse_html(html_content)), blocks, list_depth=0, ordered=False, italic=False)
+    return blocks
+
+
+def _walk(node: Node, blocks: List[Block], list_depth: int, ordered: bool, italic: bool) -> None:
+    runs: List[Run] = []
+
+    def flush():
+        paragraph = _trim_runs(runs)
+        if paragraph:
+            blocks.append(Block("paragraph", runs=paragraph))
+        runs.clear()
+
+    for child in node.children:
+        if isinstance(child, str):
+            runs.append((collapse_whitespace(child), False, italic))
+            continue
+        tag = child.tag
+        if tag == "img":
+            flush()
+            _append_image(child, blocks)
+        elif tag not in BLOCK_TAGS:
+            runs.extend(_inline_runs(child, bold=tag in ("b", "strong"), italic=italic or tag in ("i", "em")))
+        else:
+            flush()
+            _walk_block(child, blocks, list_depth, ordered, italic)
+    flush()
+
+
+def _walk_block(node: Node, blocks: List[Block], list_depth: int, ordered: bool, italic: bool) -> None:
+    tag = node.tag
+    heading_level = _heading_level(node)
+    if heading_level is not None:
+        text = node.text()
+        if text:
+            blocks.append(Block("heading", level=heading_level, runs=[(text, True, False)]))
+        return
+    if tag in ("ul", "ol"):
+        _walk(node, blocks, list_depth + 1, tag == "ol", italic)
+    elif tag == "li":
+        _append_list_item(node, blocks, max(list_depth, 1), ordered, italic)
+    elif tag == "table":
+        rows = [[cell.text() for cell in row.children if isinstance(cell, Node) and cell.tag in ("td", "th")]
+                for row in node.iter("tr")]
+        rows = [row for row in rows if row]
+        if rows:
+            blocks.append(Block("table", rows=rows))
+    elif tag == "hr":
+        return
+    else:
+        _walk(node, blocks, list_depth, ordered, italic or bool(node.classes & EMPHASIS_CLASSES))
+
+
+def _append_list_item(node: Node, blocks: List[Block], depth: int, ordered: bool, italic: bool) -> None:
+    # Inline content becomes the item; nested lists and images follow it as their own blocks
+    runs: List[Run] = []
+    nested: List[Node] = []
+    for child in node.children:
+        if isinstance(child, str):
+            runs.append((collapse_whitespace(child), False, italic))
+        elif child.tag in BLOCK_TAGS or child.tag == "img":
+            nested.append(child)
+        else:
+            runs.extend(_inline_runs(child, bold=child.tag in ("b", "strong"), italic=italic or child.tag in ("i", "em")))
+    item = _trim_runs(runs)
+    if item:
+        blocks.append(Block("list_item", level=depth, ordered=ordered, runs=item))
+    for child in nested:
+        if child.tag == "img":
+            _append_image(child, blocks)
+        else:
+            _walk_block(child, blocks, depth, ordered, italic)
+
+
+def _inline_runs(node: Node, bold: bool, italic: bool) -> List[Run]:
+    runs: List[Run] = []
+    for child in node.children:
+        if isinstance(child, str):
+            runs.append((collapse_whitespace(child), bold, italic))
+        elif child.tag == "br":
+            runs.append(("\n", bold, italic))
+        elif child.tag != "img":
+            runs.extend(_inline_runs(
+                child,
+                bold=bold or child.tag in ("b", "strong"),
+                italic=italic or child.tag in ("i", "em")
+            ))
+    return runs
+
+
+def _trim_runs(runs: List[Run]) -> List[Run]:
+    # Drop leading/trailing whitespace of the paragraph as a whole
+    merged = [run for run in runs if run[0]]
+    if not merged:
+        return []
+    first_text, bold, italic = merged[0]
+    merged[0] = (first_text.lstrip(" "), bold, italic)
+    last_text, bold, italic = merged[-1]
+    merged[-1] = (last_text.rstrip(" "), bold, italic)
+    merged = [run for run in merged if run[0]]
+    return merged if "".join(text for text, _, _ in merged).strip() else []
+
+
+def _heading_level(node: Node) -> Optional[int]:
+    if re.fullmatch(r"h[1-6]", node.tag):
+        return int(node.tag[1])
+    for class_name, level in HEADING_CLASSES.items():
+        if class_name in node.classes:
+            # The name is the document title (level 0); sections sit at h1
+            return level - 1
+    return None
+
+
+def _append_image(node: Node, blocks: List[Block]) -> None:
+    # Only data-URI and image-store images can be exported; placeholders and remote URLs are skipped
+    src = node.attrs.get("src", "").strip()
+    match = DATA_URI_PATTERN.match(src)
+    if match:
+        try:
+            data = base64.b64decode(match.group(1), validate=False)
+        except (binascii.Error, ValueError):
+            return
+    else:
+        data = load_blob_url(src)
+        if data is None:
+            return
+
+    width_px = office_image_width(node.attrs.get("width", ""), _ancestor_classes(node))
+    image = _office_image(data)
+    if image is not None:
+        blocks.append(Block("image", image=image, width_px=width_px))
+
+
+def _ancestor_classes(node: Node) -> Iterator[Set[str]]:
+    ancestor = node.parent
+    while ancestor is not None:
+        yield ancestor.classes
+        ancestor = ancestor.parent
+
+
+def _office_image(data: bytes) -> Optional[bytes]:
+    """Return image bytes Office can embed, converting formats it cannot read to PNG"""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.format in ("PNG", "JPEG", "GIF", "BMP"):
+                return data
+            buffered = io.BytesIO()
+            img.convert("RGBA").save(buffered, format="PNG")
+            return buffered.getvalue()
+    except Exception:
+        return None
+
+
+def html_to_docx(html_content: str) -> bytes:
+    """
+    Build a Word document from resume HTML
+
+    Args:
+        html_content: Resume HTML (full document or fragment)
+
+    Returns:
+        The .docx document
+    """
+    document = Document()
+    normal = document.styles["Normal"]
+    normal.font.size = DocxPt(10.5)
+    normal.element.get_or_add_rPr().get_or_add_rFonts().set(qn("w:eastAsia"), OFFICE_CJK_FONT)
+
+    for block in extract_blocks(html_content):
+        if block.kind == "heading":
+            document.add_heading(block.text, level=min(block.level, 9))
+        elif block.kind == "paragraph":
+            _add_docx_runs(document.add_paragraph(), block.runs)
+        elif block.kind == "list_item":
+            style = "List Number" if block.ordered else "List Bullet"
+            if block.level > 1:
+                style = f"{style} {min(block.level, 3)}"
+            _add_docx_runs(document.add_paragraph(style=style), block.runs)
+        elif block.kind == "table":
+            columns = max(len(row) for row in block.rows)
+            table = document.add_table(rows=len(block.rows), cols=columns)
+            table.style = "Table Grid"
+            for row_index, row in enumerate(block.rows):
+                for column_index, text in enumerate(row):
+                    table.cell(row_index, column_index).text = text
+        elif block.kind == "image":
+            width = DocxInches(min(block.width_px / 96, 6.0))
+            document.add_picture(io.BytesIO(block.image), width=width)
+
+    buffered = io.BytesIO()
+    document.save(buffered)
+    return buffered.getvalue()
+
+
+def _add_docx_runs(paragraph, runs: List[Run]) -> None:
+    for text, bold, italic in runs:
+        run = paragraph.add_run(text)
+        run.bold = bold or None
+        run.italic = italic or None
+
+
+# Slide geometry (16:9) and how many text lines fit below the title
+SLIDE_WIDTH = Inches(13.333)
+SLIDE_HEIGHT = Inches(7.5)
+SLIDE_MARGIN = Inches(0.5)
+SLIDE_LINE_HEIGHT = Inches(0.4)
+MAX_LINES_PER_SLIDE = 14
+
+
+class _Slide:
+    """Content collected for one slide before it is laid out"""
+
+    def __init__(self, title: str):
+        self.title = title
+        self.lines: List[Block] = []
+        self.tables: List[Block] = []
+        self.images: List[Block] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.lines) + sum(len(table.rows) + 1 for table in self.tables)
+
+
+def html_to_pptx(html_content: str) -> bytes:
+    """
+    Build a slide deck from resume HTML: a title slide, then one slide per section
+
+    Args:
+        html_content: Resume HTML (full document or fragment)
+
+    Returns:
+        The .pptx presentation
+    """
+    slides: List[_Slide] = []
+    current = _Slide("")
+    slides.append(current)
+    for block in extract_blocks(html_content):
+        if block.kind == "heading" and block.level <= 1:
+            if current.title or current.size:
+                current = _Slide(block.text)
+                slides.append(current)
+            else:
+                current.title = block.text
+            continue
+        # Continue long sections on another slide with the same title
+        if current.size >= MAX_LINES_PER_SLIDE and block.kind != "image":
+            current = _Slide(f"{current.title}（续）")
+            slides.append(current)
+        if block.kind == "table":
+            current.tables.append(block)
+        elif block.kind == "image":
+            current.images.append(block)
+        else:
+            current.lines.append(block)
+
+    presentation = Presentation()
+    presentation.slide_width = SLIDE_WIDTH
+    presentation.slide_height = SLIDE_HEIGHT
+    layout = presentation.slide_layouts[5]  # Title Only
+    for content in slides:
+        if not (content.title or content.size or content.images):
+            continue
+        _layout_slide(presentation.slides.add_slide(layout), content)
+
+    buffered = io.BytesIO()
+    presentation.save(buffered)
+    return buffered.getvalue()
+
+
+def _layout_slide(slide, content: _Slide) -> None:
+    slide.shapes.title.text = content.title
+    top = Inches(1.5)
+    width = SLIDE_WIDTH - 2 * SLIDE_MARGIN
+
+    # Images go down the right-hand side, text keeps clear of them
+    image_left = SLIDE_WIDTH - SLIDE_MARGIN
+    image_top = top
+    for block in content.images:
+        image_width = Inches(min(block.width_px / 96, 3.0))
+        picture = slide.shapes.add_picture(
+            io.BytesIO(block.image), SLIDE_WIDTH - SLIDE_MARGIN - image_width, image_top, width=image_width
+        )
+        image_left = min(image_left, picture.left)
+        image_top += picture.height + Inches(0.1)
+    if content.images:
+        width = image_left - SLIDE_MARGIN - Inches(0.2)
+
+    if content.lines:
+        height = SLIDE_LINE_HEIGHT * len(content.lines)
+        text_frame = slide.shapes.add_textbox(SLIDE_MARGIN, top, width, height).text_frame
+        text_frame.word_wrap = True
+        for index, block in enumerate(content.lines):
+            paragraph = text_frame.paragraphs[0] if index == 0 else text_frame.add_paragraph()
+            prefix = ""
+            if block.kind == "list_item":
+                paragraph.level = min(block.level - 1, 4)
+                prefix = "• "
+            for run_index, (text, bold, italic) in enumerate(block.runs):
+                run = paragraph.add_run()
+                run.text = prefix + text if run_index == 0 else text
+                run.font.size = Pt(14 if block.kind != "heading" else 16)
+                run.font.bold = bold or block.kind == "heading"
+                run.font.italic = italic
+        top += height + Inches(0.2)
+
+    for block in content.tables:
+        columns = max(len(row) for row in block.rows)
+        height = SLIDE_LINE_HEIGHT * len(block.rows)
+        table = slide.shapes.add_table(len(block.rows), columns, SLIDE_MARGIN, top, width, height).table
+        for row_index, row in enumerate(block.rows):
+            for column_index, text in enumerate(row):
+                table.cell(row_index, column_index).text = text
+        top += height + Inches(0.2)
+
+
+if __name__ == "__main__":
+    # Export the default template with both exporters
+    from app.utils.templates import DEFAULT_RESUME_HTML
+
+    for block in extract_blocks(DEFAULT_RESUME_HTML):
+        print(block.kind, block.level, block.text)
+    with open("test.docx", "wb") as f:
+        f.write(html_to_docx(DEFAULT_RESUME_HTML))
+    with open("test.pptx", "wb") as f:
+        f.write(html_to_pptx(DEFAULT_RESUME_HTML))
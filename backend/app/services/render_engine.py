@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+from app.models.export import RenderOptions
+from app.utils.blob_store import BlobStore
+from app.utils.cache import CACHE_DIR, make_cache_key
+from app.utils.logger import app_logger
+from app.utils.metrics import ERRORS_TOTAL, EXPORT_RENDER_SECONDS
+from app.utils.print_images import IMAGE_LAYOUTS
+from app.utils.singleflight import SingleFlight
+
+# Render pool settings
+RENDER_WORKERS = int(os.getenv("EXPORT_RENDER_WORKERS", str(os.cpu_count() or 2)))
+RENDER_TIMEOUT_SECONDS = float(os.getenv("EXPORT_RENDER_TIMEOUT", "60"))
+RENDER_MAX_JOBS_PER_WORKER = int(os.getenv("EXPORT_RENDER_MAX_JOBS", "100"))
+
+# Export cache settings
+EXPORT_CACHE_MEMORY_BYTES = int(os.getenv("EXPORT_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+EXPORT_CACHE_DISK_BYTES = int(os.getenv("EXPORT_CACHE_DISK_MB", "512")) * 1024 * 1024
+
+# Rendered exports, keyed by export_cache_key
+export_cache = BlobStore(
+    "export",
+    directory=os.path.join(CACHE_DIR, "exports"),
+    max_memory_bytes=EXPORT_CACHE_MEMORY_BYTES,
+    max_disk_bytes=EXPORT_CACHE_DISK_BYTES
+)
+export_flight = SingleFlight("export")
+
+# Part of every export cache key; bump when exporter output changes so older
+# cached renders are not served
+EXPORT_RENDERER_VERSION = "4"
+
+
+def html_digest(html_content: str) -> str:
+    """Hash export HTML once so several formats can share the digest"""
+    return hashlib.sha256(html_content.encode("utf-8")).hexdigest()
+
+
+def export_cache_key(
+    html_content: str,
+    output_format: str,
+    options: Optional[Dict[str, Any]] = None,
+    digest: Optional[str] = None
+) -> str:
+    """
+    Identify a rendered export; also used as its strong ETag
+
+    Args:
+        html_content: The HTML content to export
+        output_format: The desired output format
+        options: Render options passed to render_resume
+        digest: Precomputed html_digest of html_content, if the caller already has it
+
+    Returns:
+        Hex SHA-256 digest of the render inputs
+    """
+    digest = digest or html_digest(html_content)
+    return make_cache_key("export", EXPORT_RENDERER_VERSION, output_format, options or {}, digest)
+
+
+def _warm_worker() -> None:
+    """Import the exporters and warm the PDF fonts once per worker so the first job does not pay for it"""
+    from app.services import export_service
+    try:
+        export_service.warm_up()
+    except Exception as e:
+        # An initializer error would break the pool; the first PDF job will retry instead
+        app_logger.error(f"Render worker warm-up failed: {str(e)}")
+
+
+def _render_job(
+    html_content: str,
+    output_format: str,
+    options: Optional[Dict[str, Any]],
+    images_prepared: bool = False
+) -> bytes:
+    """Run render_resume inside a worker process"""
+    from app.services.export_service import render_resume
+    return render_resume(html_content, output_format, options, images_prepared)
+
+
+def _prepare_images_job(html_content: str, output_format: str, options: Optional[Dict[str, Any]]) -> str:
+    """Run prepare_export_images inside a worker process"""
+    from app.services.export_service import prepare_export_images
+    return prepare_export_images(html_content, output_format, options)
+
+
+class RenderEngine:
+    """
+    Pool of long-lived worker processes for CPU-bound export rendering.
+
+    Workers keep WeasyPrint and the exporters imported between jobs. At most
+    one job per worker is submitted at a time; the rest wait for a slot here,
+    so a job's timeout covers only its own run, not time spent queued behind
+    others. The pool is replaced after RENDER_MAX_JOBS_PER_WORKER jobs per
+    worker (to cap memory growth in long-running renderers) and when a running
+    job times out (to get rid of the stuck worker).
+    """
+
+    def __init__(
+        self,
+        workers: int = RENDER_WORKERS,
+        timeout: float = RENDER_TIMEOUT_SECONDS,
+        max_jobs_per_worker: int = RENDER_MAX_JOBS_PER_WORKER
+    ):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs = 0
+        # One slot per worker, so submitted jobs start right away
+        self._slots = asyncio.Semaphore(self.workers)
+
+    def start(self) -> None:
+        """Create the worker pool"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker
+            )
+            self._jobs = 0
+            app_logger.info(f"Render engine started with {self.workers} workers")
+
+    async def shutdown(self) -> None:
+        """Stop the worker pool, waiting for running jobs to finish"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+            app_logger.info("Render engine stopped")
+
+    async def run(self, func: Callable[..., Any], *args: Any, label: str = "job") -> Any:
+        """
+        Run a picklable function in the pool and await its result
+
+        Args:
+            func: Module-level function to run in a worker
+            args: Picklable positional arguments
+            label: Label used for the render-time metric
+
+        Returns:
+            The function's return value
+
+        Raises:
+            TimeoutError: If the job exceeds the per-job timeout once dispatched
+        """
+        with EXPORT_RENDER_SECONDS.labels(label).time():
+            async with self._slots:
+                return await self._run_dispatched(func, *args)
+
+    async def _run_dispatched(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Submit a job while holding a worker slot and wait for it, with the per-job timeout"""
+        self.start()
+        if self._jobs >= self.workers * self.max_jobs_per_worker:
+            app_logger.info("Recycling render workers")
+            self._retire(self._executor, kill_after=None)
+            self.start()
+        self._jobs += 1
+
+        executor = self._executor
+        future = executor.submit(func, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            ERRORS_TOTAL.labels("export_timeout").inc()
+            if future.running():
+                app_logger.error(f"Render job timed out after {self.timeout}s, replacing workers")
+                self._retire(executor, kill_after=self.timeout)
+            else:
+                # Never started (e.g. workers still warming up; the wait cancelled it): keep the pool
+                app_logger.error(f"Render job not started within {self.timeout}s")
+            raise TimeoutError(f"Rendering timed out after {self.timeout} seconds")
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed inside a native library); start fresh next time
+            ERRORS_TOTAL.labels("export_worker_crash").inc()
+            app_logger.error("Render worker died, replacing workers")
+            self._retire(executor, kill_after=None)
+            raise
+
+    async def render(
+        self,
+        html_content: str,
+        output_format: str,
+        options: Optional[Dict[str, Any]] = None,
+        cache_key: Optional[str] = None,
+        images_prepared: bool = False
+    ) -> bytes:
+        """
+        Render a resume export in the pool, reusing earlier renders of the same input
+
+        Args:
+            html_content: The HTML content to export
+            output_format: The desired output format (pdf, docx, pptx, md, html)
+            options: Render options (image_dpi, jpeg_quality, optimize_images)
+            cache_key: Precomputed export_cache_key, if the caller already has it
+            images_prepared: True if html_content already went through prepare_export_images;
+                cache_key must then be given, keyed on the original HTML
+
+        Returns:
+            The rendered document
+        """
+        key = cache_key or export_cache_key(html_content, output_format, options)
+        # The cache reads and writes multi-megabyte files; keep that off the event loop
+        content = await asyncio.to_thread(export_cache.get, key)
+        if content is not None:
+            return content
+
+        async def render_and_store() -> bytes:
+            rendered = await self.run(
+                _render_job, html_content, output_format, options, images_prepared, label=output_format
+            )
+            await asyncio.to_thread(export_cache.set, key, rendered)
+            return rendered
+
+        # Identical exports requested concurrently share one render
+        return await export_flight.do(key, render_and_store)
+
+    async def render_bundle(
+        self,
+        html_content: str,
+        output_formats: List[str],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, bytes]:
+        """
+        Render one resume into several formats in parallel
+
+        The HTML is hashed once for all formats and cached formats are reused.
+        For the rest, the image pass runs once per image layout (PDF, Office)
+        instead of once per format, and the formats are then rendered
+        concurrently in the pool from the prepared, smaller HTML.
+
+        Args:
+            html_content: The HTML content to export
+            output_formats: Distinct output formats to render
+            options: Render options shared by every format
+
+        Returns:
+            Mapping of output format to rendered document
+        """
+        digest = html_digest(html_content)
+        keys = [export_cache_key(html_content, output_format, options, digest) for output_format in output_formats]
+        cached = await asyncio.gather(*(asyncio.to_thread(export_cache.get, key) for key in keys))
+
+        # One image pass per layout still needed, prepared for its first format
+        optimize_images = RenderOptions(**(options or {})).optimize_images
+        layouts: Dict[str, str] = {}
+        for output_format, content in zip(output_formats, cached):
+            if content is None and optimize_images and output_format in IMAGE_LAYOUTS:
+                layouts.setdefault(IMAGE_LAYOUTS[output_format], output_format)
+        prepared_html = dict(zip(layouts, await asyncio.gather(*(
+            self.run(_prepare_images_job, html_content, output_format, options, label="images")
+            for output_format in layouts.values()
+        ))))
+
+        async def render_format(output_format: str, key: str, content: Optional[bytes]) -> bytes:
+            if content is not None:
+                return content
+            layout = IMAGE_LAYOUTS.get(output_format)
+            if layout not in prepared_html:
+                return await self.render(html_content, output_format, options, key)
+            return await self.render(prepared_html[layout], output_format, options, key, images_prepared=True)
+
+        documents = await asyncio.gather(*(
+            render_format(output_format, key, content)
+            for output_format, key, content in zip(output_formats, keys, cached)
+        ))
+        return dict(zip(output_formats, documents))
+
+    def _retire(self, executor: ProcessPoolExecutor, kill_after: Optional[float]) -> None:
+        """
+        Stop sending work to a pool and let it wind down
+
+        Args:
+            executor: The pool to retire (ignored if it was already replaced)
+            kill_after: If set, terminate any worker still running after this many seconds
+        """
+        if self._executor is not executor:
+            return
+        self._executor = None
+        executor.shutdown(wait=False)
+        if kill_after is not None:
+            asyncio.get_running_loop().call_later(kill_after, _terminate_workers, executor)
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """Forcefully stop the processes of a retired pool"""
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        if process.is_alive():
+            process.terminate()
+
+
+# Shared engine, started and stopped in the FastAPI lifespan
+render_engine = RenderEngine()
@@ -0,0 +1,216 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from app.utils.logger import app_logger
+from app.utils.metrics import CACHE_EVICTIONS_TOTAL, CACHE_REQUESTS_TOTAL
+
+
+class BlobStore:
+    """
+    Byte-bounded store for binary blobs: an in-memory LRU in front of a disk directory.
+
+    Keys must be hex digests (see make_cache_key). Both tiers are bounded by
+    total bytes and evict least recently used blobs first. Disk blobs live at
+    <directory>/<key[:2]>/<key> and are written atomically, so the directory
+    survives restarts and can be shared by several processes. The disk index
+    is built on the first write, so processes that only read (render workers)
+    never scan the directory.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        directory: Optional[str] = None,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024
+    ):
+        self.name = name
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # Sizes of the blobs on disk, least recently used first
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._indexed = False
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                app_logger.error(f"Disabling disk tier of blob store '{name}': {str(e)}")
+                self.directory = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a blob, promoting disk hits into the memory tier
+
+        Args:
+            key: Hex digest identifying the blob
+
+        Returns:
+            The blob, or None on a miss
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                CACHE_REQUESTS_TOTAL.labels(self.name, "memory_hit").inc()
+                return data
+
+            if self.directory and key not in self._disk:
+                # Another process sharing the directory may have written it
+                self._adopt_file(key)
+
+            if self.directory and key in self._disk:
+                path = self._path(key)
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    os.utime(path)
+                    self._disk.move_to_end(key)
+                    self._put_memory(key, data)
+                    self.stats["disk_hits"] += 1
+                    CACHE_REQUESTS_TOTAL.labels(self.name, "disk_hit").inc()
+                    return data
+                except OSError as e:
+                    app_logger.error(f"Blob store '{self.name}' read failed: {str(e)}")
+                    self._disk_bytes -= self._disk.pop(key)
+
+            self.stats["misses"] += 1
+            CACHE_REQUESTS_TOTAL.labels(self.name, "miss").inc()
+            return None
+
+    def contains(self, key: str) -> bool:
+        """Check whether a blob is stored, without counting a lookup"""
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def set(self, key: str, data: bytes) -> None:
+        """
+        Store a blob in both tiers
+
+        Args:
+            key: Hex digest identifying the blob
+            data: Blob contents
+        """
+        with self._lock:
+            self._put_memory(key, data)
+
+            if self.directory:
+                path = self._path(key)
+                try:
+                    self._ensure_index()
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    # Write to a temporary name and rename so readers never see a partial blob
+                    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                    os.replace(temp_path, path)
+                    self._disk_bytes -= self._disk.pop(key, 0)
+                    self._disk[key] = len(data)
+                    self._disk_bytes += len(data)
+                    self._evict_disk()
+                except OSError as e:
+                    app_logger.error(f"Blob store '{self.name}' write failed: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop every blob from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self.directory:
+                try:
+                    self._ensure_index()
+                except OSError as e:
+                    app_logger.error(f"Blob store '{self.name}' index failed: {str(e)}")
+            for key in list(self._disk):
+                self._remove_file(key)
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self._load_index()
+            self._indexed = True
+
+    def _load_index(self) -> None:
+        # Rebuild the LRU order from file modification times (bumped on every read)
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        # Replaces any blobs adopted before the scan, which it includes
+        self._disk.clear()
+        self._disk_bytes = 0
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _adopt_file(self, key: str) -> None:
+        try:
+            size = os.path.getsize(self._path(key))
+        except OSError:
+            return
+        # Whoever wrote the file accounts for it; adopting never evicts
+        self._disk[key] = size
+        self._disk_bytes += size
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+        self._memory_bytes -= len(self._memory.pop(key, b""))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+            CACHE_EVICTIONS_TOTAL.labels(self.name).inc()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._remove_file(key)
+            self.stats["evictions"] += 1
+            CACHE_EVICTIONS_TOTAL.labels(self.name).inc()
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    # Test the blob store
+    from app.utils.cache import make_cache_key
+
+    store = BlobStore("test", directory="test_blobs", max_memory_bytes=1024, max_disk_bytes=4096)
+    key = make_cache_key("pdf", "<div>Test HTML content</div>")
+    print("First lookup:", store.get(key))
+    store.set(key, b"%PDF-1.7 test")
+    print("Second lookup:", store.get(key))
+    print("Stats:", store.stats)
+    store.clear()
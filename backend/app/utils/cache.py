@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.utils.logger import app_logger
+from app.utils.metrics import CACHE_EVICTIONS_TOTAL, CACHE_REQUESTS_TOTAL
+
+# Directory shared by the on-disk cache tiers
+CACHE_DIR = os.getenv(
+    "CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_generator")
+)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a content-addressed cache key from arbitrary JSON-serialisable parts
+
+    Args:
+        parts: Values that together identify a cached result
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache: an in-memory LRU in front of an on-disk SQLite table.
+
+    Both tiers honour the same TTL. The memory tier is bounded by entry count,
+    the disk tier by entry count as well (oldest entries are evicted first).
+    Values must be JSON-serialisable.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = 3600.0,
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 5000
+    ):
+        self.name = name
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                app_logger.error(f"Disabling disk tier of cache '{name}': {str(e)}")
+                self._conn = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value, promoting disk hits into the memory tier
+
+        Args:
+            key: Cache key (see make_cache_key)
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    CACHE_REQUESTS_TOTAL.labels(self.name, "memory_hit").inc()
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        raw_value, created_at = row
+                        if now - created_at <= self.ttl_seconds:
+                            self._conn.execute(
+                                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+                            )
+                            self._conn.commit()
+                            value = json.loads(raw_value)
+                            self._put_memory(key, created_at, value)
+                            self.stats["disk_hits"] += 1
+                            CACHE_REQUESTS_TOTAL.labels(self.name, "disk_hit").inc()
+                            return value
+                        self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                        self._conn.commit()
+                except sqlite3.Error as e:
+                    app_logger.error(f"Cache '{self.name}' disk read failed: {str(e)}")
+
+            self.stats["misses"] += 1
+            CACHE_REQUESTS_TOTAL.labels(self.name, "miss").inc()
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in both tiers
+
+        Args:
+            key: Cache key (see make_cache_key)
+            value: JSON-serialisable value to store
+        """
+        now = time.time()
+        with self._lock:
+            self._put_memory(key, now, value)
+
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value, ensure_ascii=False), now, now)
+                    )
+                    self._evict_disk(now)
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    app_logger.error(f"Cache '{self.name}' disk write failed: {str(e)}")
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() for async callers: the SQLite read (and its access-time commit) runs in a thread"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """set() for async callers: the SQLite write and commit run in a thread"""
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+
+    def _put_memory(self, key: str, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+            CACHE_EVICTIONS_TOTAL.labels(self.name).inc()
+
+    def _evict_disk(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.stats["evictions"] += overflow
+            CACHE_EVICTIONS_TOTAL.labels(self.name).inc(overflow)
+
+
+if __name__ == "__main__":
+    # Test the cache
+    cache = ResponseCache("test", db_path="test_cache.sqlite3", ttl_seconds=60)
+    key = make_cache_key("prompt", "model", {"temperature": 0.2})
+    print("First lookup:", cache.get(key))
+    cache.set(key, {"html_content": "<div>cached</div>", "image_placeholders": {}})
+    print("Second lookup:", cache.get(key))
+    print("Stats:", cache.stats)
+    cache.clear()
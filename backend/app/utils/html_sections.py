@@ -0,0 +1,230 @@
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# 各类简历部分及其识别关键词（匹配部分标题、用户输入字段名和更新指示）
+SECTION_KEYWORDS = {
+    "header": ["个人信息", "姓名", "邮箱", "手机", "电话", "所在地", "地址", "求职意向",
+               "联系方式", "照片", "头像", "name", "email", "phone", "contact", "photo"],
+    "summary": ["概述", "简介", "自我评价", "个人总结", "summary", "profile", "objective"],
+    "education": ["教育", "学历", "学校", "毕业", "education", "school", "degree"],
+    "work": ["工作", "实习", "职业经历", "experience", "employment", "work", "job"],
+    "projects": ["项目", "project"],
+    "skills": ["技能", "skill"],
+    "languages": ["语言", "language"],
+    "certificates": ["证书", "资质", "certificat", "license"],
+    "interests": ["兴趣", "爱好", "interest", "hobb"],
+}
+
+# 涉及整体排版的指示无法只更新局部，需要整份重新生成
+LAYOUT_KEYWORDS = ["排版", "顺序", "布局", "样式", "颜色", "字体", "模板", "风格",
+                   "layout", "order", "style", "color", "font", "template", "design"]
+
+_DIV_TAG_PATTERN = re.compile(r"<(/?)div\b[^>]*>", re.IGNORECASE)
+_SECTION_TITLE_PATTERN = re.compile(
+    r'<div\s+class="section-title"[^>]*>(.*?)</div>', re.IGNORECASE | re.DOTALL
+)
+_HEADER_PATTERN = re.compile(r'<div\s+class="resume-header"[^>]*>', re.IGNORECASE)
+_BODY_END_PATTERN = re.compile(r"</body\s*>", re.IGNORECASE)
+_BODY_PATTERN = re.compile(r"<body\b[^>]*>(.*?)</body\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_TRAILING_COMMENT_PATTERN = re.compile(r"(\s*<!--(?:(?!-->).)*-->)*\s*$", re.DOTALL)
+
+
+def classify_section(text: str) -> Optional[str]:
+    """
+    根据标题或字段名判断其所属的简历部分
+
+    Args:
+        text: 部分标题、用户输入字段名等文本
+
+    Returns:
+        部分类型（见 SECTION_KEYWORDS），无法识别时返回None
+    """
+    lowered = text.lower()
+    for key, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return key
+    return None
+
+
+def split_document_shell(html: str) -> Optional[Tuple[str, str, str]]:
+    """
+    将完整HTML文档拆分为<body>之前的外壳、<body>内部内容和<body>之后的外壳
+
+    Args:
+        html: 完整的HTML文档
+
+    Returns:
+        (前缀, body内容, 后缀)；没有<body>标签时返回None
+    """
+    match = _BODY_PATTERN.search(html)
+    if not match:
+        return None
+    return html[:match.start(1)], match.group(1), html[match.end(1):]
+
+
+def extract_body_html(html: str) -> str:
+    """
+    提取<body>内部的HTML，没有<body>标签时原样返回
+
+    Args:
+        html: 完整HTML文档或HTML片段
+
+    Returns:
+        <body>内部的HTML
+    """
+    shell = split_document_shell(html)
+    return shell[1] if shell else html
+
+
+def _matching_div_end(html: str, start: int) -> int:
+    """返回从start处开始的div元素（含结束标签）的结束位置"""
+    depth = 0
+    for match in _DIV_TAG_PATTERN.finditer(html, start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return match.end()
+    return len(html)
+
+
+def _balanced_end(html: str, start: int, limit: int) -> int:
+    """返回[start, limit)中第一个不成对的</div>的位置，没有则返回limit"""
+    depth = 0
+    for match in _DIV_TAG_PATTERN.finditer(html, start, limit):
+        depth += -1 if match.group(1) else 1
+        if depth < 0:
+            return match.start()
+    return limit
+
+
+def split_resume_sections(html: str) -> List[Dict[str, Any]]:
+    """
+    将按默认模板生成的HTML简历拆分为若干部分（个人信息、教育经历、工作经历等）
+
+    Args:
+        html: 完整的HTML简历
+
+    Returns:
+        部分列表，每项包含 key（部分类型）、title（标题）、start/end（在html中的位置）
+        和 html（该部分的HTML片段）。无法识别结构时返回空列表。
+    """
+    sections = []
+
+    header_match = _HEADER_PATTERN.search(html)
+    if header_match:
+        header_end = _matching_div_end(html, header_match.start())
+        sections.append({
+            "key": "header",
+            "title": "个人信息",
+            "start": header_match.start(),
+            "end": header_end,
+        })
+
+    body_end_match = _BODY_END_PATTERN.search(html)
+    body_end = body_end_match.start() if body_end_match else len(html)
+
+    titles = list(_SECTION_TITLE_PATTERN.finditer(html))
+    for index, match in enumerate(titles):
+        limit = titles[index + 1].start() if index + 1 < len(titles) else body_end
+        end = _balanced_end(html, match.start(), limit)
+        title = _TAG_PATTERN.sub("", match.group(1)).strip()
+        sections.append({
+            "key": classify_section(title) or title,
+            "title": title,
+            "start": match.start(),
+            "end": end,
+        })
+
+    for section in sections:
+        # 下一部分前的注释（如 <!-- 工作经历 -->）不属于当前部分
+        fragment = _TRAILING_COMMENT_PATTERN.sub("", html[section["start"]:section["end"]])
+        section["html"] = fragment
+        section["end"] = section["start"] + len(fragment)
+
+    return sections
+
+
+def find_affected_sections(
+    sections: List[Dict[str, Any]],
+    name: str,
+    position: str,
+    additional_info: Optional[Dict[str, Any]] = None,
+    update_instructions: Optional[str] = None
+) -> Optional[Dict[str, List[str]]]:
+    """
+    判断新的用户输入和更新指示会影响哪些部分
+
+    Args:
+        sections: split_resume_sections 的返回值
+        name: 用户姓名
+        position: 职位
+        additional_info: 额外的简历信息
+        update_instructions: 更新现有内容的具体指示
+
+    Returns:
+        受影响部分类型到相关输入字段名的映射；
+        如果更新无法局限在已有部分内（涉及排版、新增部分，或受影响的类型对应多个部分等），返回None
+    """
+    existing_keys = {section["key"] for section in sections}
+    affected: Dict[str, List[str]] = {}
+
+    header = next((s for s in sections if s["key"] == "header"), None)
+    if header is not None and (name not in header["html"] or position not in header["html"]):
+        affected.setdefault("header", [])
+
+    for field in (additional_info or {}):
+        key = classify_section(str(field))
+        if key is None or key not in existing_keys:
+            return None
+        affected.setdefault(key, []).append(field)
+
+    if update_instructions:
+        lowered = update_instructions.lower()
+        if any(keyword in lowered for keyword in LAYOUT_KEYWORDS):
+            return None
+        mentioned: Set[str] = {
+            key for key, keywords in SECTION_KEYWORDS.items()
+            if any(keyword in lowered for keyword in keywords)
+        }
+        if not mentioned or not mentioned <= existing_keys:
+            return None
+        for key in mentioned:
+            affected.setdefault(key, [])
+
+    # 同一类型有多个部分时（如工作经历和实习经历）无法确定要改哪一个
+    if any(sum(section["key"] == key for section in sections) > 1 for key in affected):
+        return None
+
+    return affected or None
+
+
+def splice_sections(html: str, sections: List[Dict[str, Any]], replacements: Dict[int, str]) -> str:
+    """
+    将重新生成的部分替换回原HTML
+
+    Args:
+        html: 原始HTML简历
+        sections: split_resume_sections 的返回值
+        replacements: 部分在sections中的下标到新HTML片段的映射
+            （同一类型可能对应多个部分，如工作经历和实习经历，因此不能按类型替换）
+
+    Returns:
+        替换后的HTML
+    """
+    # 从后往前替换，保证前面部分的位置不变
+    for index in sorted(replacements, key=lambda i: sections[i]["start"], reverse=True):
+        section = sections[index]
+        html = html[:section["start"]] + replacements[index].strip() + html[section["end"]:]
+    return html
+
+
+if __name__ == "__main__":
+    from app.utils.templates import DEFAULT_RESUME_HTML
+
+    # 测试拆分默认模板
+    for section in split_resume_sections(DEFAULT_RESUME_HTML):
+        print(section["key"], section["title"], section["start"], section["end"])
+
+    sections = split_resume_sections(DEFAULT_RESUME_HTML)
+    print(find_affected_sections(sections, "{姓名}", "{求职意向}", {"专业技能": "Python, SQL"}))
+    print(find_affected_sections(sections, "{姓名}", "{求职意向}", None, "请调整排版顺序"))
@@ -0,0 +1,252 @@
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+from app.utils.html_tree import (
+    BLOCK_TAGS,
+    HEADING_CLASSES,
+    SKIPPED_ELEMENTS,
+    VOID_ELEMENTS,
+    collapse_whitespace
+)
+
+_ESCAPE_PATTERN = re.compile(r"([\\`*_\[\]])")
+_SPACES_PATTERN = re.compile(r" {2,}")
+
+
+class HtmlToMarkdown(HTMLParser):
+    """
+    流式HTML转Markdown转换器，针对简历常用结构（标题、部分、列表、表格、图片占位符）。
+
+    逐段调用feed()传入HTML，返回已经完成的Markdown块；最后调用finish()取得剩余内容。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # 已完成的块：(类型, 文本)，类型为"list"的相邻块之间不空行
+        self._blocks: List[Tuple[str, str]] = []
+        self._emitted = 0
+        self._inline: List[str] = []
+        self._prefix = ""
+        self._kind = "paragraph"
+        # 打开的元素：(标签, 角色)，角色用于在结束标签时收尾
+        self._stack: List[Tuple[str, str]] = []
+        self._lists: List[List] = []  # [是否有序, 当前序号]
+        self._links: List[Tuple[int, str]] = []
+        self._table: Optional[List[List[str]]] = None
+        self._skip_depth = 0
+
+    def feed(self, data: str) -> str:
+        """
+        处理一段HTML
+
+        Args:
+            data: HTML片段
+
+        Returns:
+            本次新完成的Markdown文本（可能为空）
+        """
+        super().feed(data)
+        return self._drain()
+
+    def finish(self) -> str:
+        """
+        结束转换，返回剩余的Markdown文本
+        """
+        self.close()
+        self._flush()
+        rest = self._drain()
+        return rest + "\n" if rest or self._emitted else rest
+
+    def _drain(self) -> str:
+        parts = []
+        for index in range(self._emitted, len(self._blocks)):
+            kind, text = self._blocks[index]
+            if index > 0:
+                previous_kind = self._blocks[index - 1][0]
+                parts.append("\n" if kind == previous_kind == "list" else "\n\n")
+            parts.append(text)
+        self._emitted = len(self._blocks)
+        return "".join(parts)
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth:
+            if tag in SKIPPED_ELEMENTS:
+                self._skip_depth += 1
+            return
+        if tag in SKIPPED_ELEMENTS:
+            self._skip_depth = 1
+            return
+
+        attributes = {name: value or "" for name, value in attrs}
+        role = ""
+        if self._table is not None:
+            role = self._start_table_tag(tag)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            role = self._start_block(tag, attributes)
+        elif tag in ("b", "strong"):
+            self._inline.append("**")
+            role = "**"
+        elif tag in ("i", "em"):
+            self._inline.append("*")
+            role = "*"
+        elif tag == "code":
+            self._inline.append("`")
+            role = "`"
+        elif tag == "a" and attributes.get("href"):
+            self._links.append((len(self._inline), attributes["href"]))
+            role = "link"
+
+        if tag == "img":
+            alt = _escape(attributes.get("alt", ""))
+            self._inline.append(f"![{alt}]({attributes.get('src', '')})")
+        elif tag == "br":
+            self._inline.append("\\\n")
+        elif tag not in VOID_ELEMENTS:
+            self._stack.append((tag, role))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS and self._stack and self._stack[-1][0] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip_depth:
+            if tag in SKIPPED_ELEMENTS:
+                self._skip_depth -= 1
+            return
+        if tag in VOID_ELEMENTS or all(open_tag != tag for open_tag, _ in self._stack):
+            return
+        # 关闭到对应的开始标签为止（容忍未闭合的内层元素）
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            self._end_element(open_tag, role)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        self._inline.append(_escape(collapse_whitespace(data)))
+
+    def _start_block(self, tag: str, attributes: dict) -> str:
+        level = _heading_level(tag, attributes)
+        if level:
+            self._prefix = "#" * level + " "
+            self._kind = "heading"
+            return "heading"
+        if tag in ("ul", "ol"):
+            self._lists.append([tag == "ol", 0])
+            return "list"
+        if tag == "li":
+            depth = max(len(self._lists), 1)
+            ordered, counter = self._lists[-1] if self._lists else (False, 0)
+            if self._lists:
+                self._lists[-1][1] += 1
+            marker = f"{counter + 1}. " if ordered else "- "
+            self._prefix = "   " * (depth - 1) + marker
+            self._kind = "list"
+            return "item"
+        if tag == "table":
+            self._table = []
+            return "table"
+        if tag == "hr":
+            self._blocks.append(("paragraph", "---"))
+        if tag == "blockquote":
+            return "quote"
+        return "block"
+
+    def _start_table_tag(self, tag: str) -> str:
+        if tag == "tr":
+            self._table.append([])
+            return "row"
+        if tag in ("td", "th"):
+            self._inline = []
+            return "cell"
+        if tag in BLOCK_TAGS:
+            # 单元格内的块级元素只作为空格分隔
+            self._inline.append(" ")
+        return ""
+
+    def _end_element(self, tag: str, role: str) -> None:
+        if role in ("**", "*", "`"):
+            self._inline.append(role)
+        elif role == "link" and self._links:
+            start, href = self._links.pop()
+            text = "".join(self._inline[start:]).strip()
+            self._inline[start:] = [f"[{text}]({href})"]
+        elif role == "cell":
+            if self._table is not None:
+                if not self._table:
+                    self._table.append([])
+                self._table[-1].append(self._inline_text().replace("|", "\\|"))
+            self._inline = []
+        elif role == "table":
+            self._emit_table()
+        elif role == "list":
+            self._flush()
+            if self._lists:
+                self._lists.pop()
+        elif role in ("heading", "item", "block", "quote") or tag in BLOCK_TAGS:
+            self._flush()
+
+    def _emit_table(self) -> None:
+        rows = [row for row in (self._table or []) if row]
+        self._table = None
+        self._inline = []
+        if not rows:
+            return
+        columns = max(len(row) for row in rows)
+        rows = [row + [""] * (columns - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * columns]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        self._blocks.append(("table", "\n".join(lines)))
+
+    def _inline_text(self) -> str:
+        return _SPACES_PATTERN.sub(" ", "".join(self._inline)).strip()
+
+    def _flush(self) -> None:
+        if self._table is not None:
+            return
+        text = self._inline_text()
+        if text:
+            if any(role == "quote" for _, role in self._stack):
+                text = "> " + text
+            self._blocks.append((self._kind, self._prefix + text))
+        self._inline = []
+        self._prefix = ""
+        self._kind = "paragraph"
+
+
+def _heading_level(tag: str, attributes: dict) -> int:
+    if len(tag) == 2 and tag[0] == "h" and tag[1] in "123456":
+        return int(tag[1])
+    classes = attributes.get("class", "").split()
+    for class_name, level in HEADING_CLASSES.items():
+        if class_name in classes:
+            return level
+    return 0
+
+
+def _escape(text: str) -> str:
+    return _ESCAPE_PATTERN.sub(r"\\\1", text)
+
+
+def html_to_markdown(html: str) -> str:
+    """
+    将简历HTML转换为Markdown
+
+    Args:
+        html: 完整HTML文档或HTML片段
+
+    Returns:
+        Markdown文本
+    """
+    converter = HtmlToMarkdown()
+    return converter.feed(html) + converter.finish()
+
+
+if __name__ == "__main__":
+    # 测试转换默认模板
+    from app.utils.templates import DEFAULT_RESUME_HTML
+    print(html_to_markdown(DEFAULT_RESUME_HTML))
@@ -0,0 +1,210 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+# 没有结束标签的元素
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "source", "track", "wbr"}
+
+# 内容不参与导出的元素
+SKIPPED_ELEMENTS = {"script", "style", "head", "title", "noscript", "template"}
+
+# 块级元素：开始和结束时结束当前段落（导出器共用）
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+}
+
+# 作为标题的模板class及其标题级别（与h1-h6及Markdown标题级别一致，姓名为1级）
+HEADING_CLASSES = {
+    "name": 1,
+    "section-title": 2,
+    "school-name": 3,
+    "company-name": 3,
+    "project-title": 3,
+}
+
+# 模板class对应的图片显示宽度（CSS像素，每英寸96像素）
+IMAGE_CLASS_WIDTHS = {"profile-photo": 100, "school-logo": 50}
+
+# 不在上述class中的图片在Office文档中的显示宽度（CSS像素）
+DEFAULT_IMAGE_WIDTH = 300
+
+# base64编码的data URI图片，分组1为图片数据
+DATA_URI_PATTERN = re.compile(r"^data:image/[\w.+-]+;base64,(.*)$", re.DOTALL)
+
+# 遇到这些标签时隐式关闭的同类元素（处理省略结束标签的写法）
+_IMPLICIT_CLOSE = {
+    "li": {"li"},
+    "p": {"p"},
+    "tr": {"tr"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+}
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class Node:
+    """简化的HTML元素节点，子节点为Node或文本字符串"""
+
+    def __init__(self, tag: str, attrs: Optional[Dict[str, str]] = None, parent: Optional["Node"] = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children: List[Union["Node", str]] = []
+
+    @property
+    def classes(self) -> Set[str]:
+        """元素的class集合"""
+        return set(self.attrs.get("class", "").split())
+
+    def iter(self, tag: Optional[str] = None) -> Iterator["Node"]:
+        """深度优先遍历子孙元素（含自身），可按标签过滤"""
+        if tag is None or self.tag == tag:
+            yield self
+        for child in self.children:
+            if isinstance(child, Node):
+                yield from child.iter(tag)
+
+    def find(self, tag: str) -> Optional["Node"]:
+        """返回第一个指定标签的子孙元素"""
+        return next(self.iter(tag), None)
+
+    def text(self) -> str:
+        """元素内的全部文本，连续空白合并为一个空格"""
+        return collapse_whitespace("".join(self._text_parts())).strip()
+
+    def _text_parts(self) -> Iterator[str]:
+        for child in self.children:
+            if isinstance(child, Node):
+                if child.tag == "br":
+                    yield "\n"
+                else:
+                    yield from child._text_parts()
+            else:
+                yield child
+
+
+def collapse_whitespace(text: str) -> str:
+    """按HTML规则将连续空白合并为一个空格"""
+    return _WHITESPACE_PATTERN.sub(" ", text)
+
+
+def office_image_width(width_attr: str, ancestor_classes: Iterable[Iterable[str]]) -> int:
+    """
+    图片在DOCX/PPTX中的显示宽度：数字width属性优先，其次是最近的带模板图片class的祖先，否则为默认宽度
+
+    Args:
+        width_attr: <img>的width属性值
+        ancestor_classes: 由内向外各祖先元素的class
+
+    Returns:
+        显示宽度（CSS像素）
+    """
+    if width_attr.isdigit():
+        return int(width_attr)
+    for classes in ancestor_classes:
+        widths = [IMAGE_CLASS_WIDTHS[name] for name in classes if name in IMAGE_CLASS_WIDTHS]
+        if widths:
+            return widths[0]
+    return DEFAULT_IMAGE_WIDTH
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self._current = self.root
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth:
+            if tag in SKIPPED_ELEMENTS:
+                self._skip_depth += 1
+            return
+        if tag in SKIPPED_ELEMENTS:
+            self._skip_depth = 1
+            return
+
+        closes = _IMPLICIT_CLOSE.get(tag)
+        if closes:
+            self._close_implicit(closes)
+
+        node = Node(tag, {name: value or "" for name, value in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        if self._skip_depth:
+            return
+        node = Node(tag, {name: value or "" for name, value in attrs}, self._current)
+        self._current.children.append(node)
+
+    def handle_endtag(self, tag):
+        if self._skip_depth:
+            if tag in SKIPPED_ELEMENTS:
+                self._skip_depth -= 1
+            return
+        if tag in VOID_ELEMENTS:
+            return
+        # 向上查找对应的开始标签，找不到时忽略多余的结束标签
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        if not self._skip_depth and data:
+            self._current.children.append(data)
+
+    def _close_implicit(self, closes: Set[str]) -> None:
+        # 只在最近的列表/表格容器内查找，避免跨越嵌套结构
+        node = self._current
+        while node is not self.root and node.tag not in ("ul", "ol", "table", "tbody", "thead", "tfoot"):
+            if node.tag in closes:
+                self._current = node.parent
+                return
+            node = node.parent
+
+
+def parse_html(html: str) -> Node:
+    """
+    将HTML解析为简化的节点树（容错，允许省略结束标签）
+
+    Args:
+        html: 完整HTML文档或HTML片段
+
+    Returns:
+        文档根节点
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def find_body(root: Node) -> Node:
+    """
+    返回<body>元素，HTML片段没有<body>时返回根节点
+
+    Args:
+        root: parse_html返回的根节点
+
+    Returns:
+        <body>节点或根节点
+    """
+    return root.find("body") or root
+
+
+if __name__ == "__main__":
+    # 测试解析
+    tree = parse_html("<html><head><style>p {}</style></head><body>"
+                      "<div class='section-title'>教育经历</div><ul><li>一<li>二</ul></body></html>")
+    body = find_body(tree)
+    print([node.tag for node in body.iter()])
+    print([li.text() for li in body.iter("li")])
@@ -1,8 +1,50 @@
 import base64
+import os
 from io import BytesIO
-from PIL import Image, ImageDraw
+from PIL import ExifTags, Image, ImageDraw, ImageOps
 import random
-from typing import Tuple
+from typing import Optional, Tuple
+from app.utils.metrics import IMAGE_RESIZE_SECONDS
+
+# Output encoding settings
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "82"))
+IMAGE_PHOTO_FORMAT = os.getenv("IMAGE_PHOTO_FORMAT", "JPEG").upper()
+
+# Images with at most this many distinct colours are graphics and stay lossless
+GRAPHIC_MAX_COLORS = 256
+# Greyscale images always fit in 256 levels, so they need a tighter limit
+GRAPHIC_MAX_GREY_LEVELS = 32
+
+# EXIF orientations that swap width and height
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+IMAGE_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+# Leading bytes of the image formats we accept and serve
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_image_type(image_data: bytes) -> Optional[str]:
+    """
+    Identify an image format from its leading bytes
+    
+    Args:
+        image_data: Raw image bytes (the first 12 are enough)
+        
+    Returns:
+        The MIME type, or None if the bytes are not a supported image
+    """
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return mime_type
+    if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
 
 def create_placeholder_image(
     width: int = 200, 
@@ -62,32 +104,128 @@ def create_placeholder_image(
     return f"data:image/png;base64,{img_str}"
 
 
-def resize_image(image_data: bytes, max_width: int = 800, max_height: int = 800) -> bytes:
+def read_image_size(image_data: bytes) -> Tuple[int, int]:
+    """
+    Read an image's dimensions from its header without decoding the pixels
+    
+    Args:
+        image_data: Raw image bytes
+        
+    Returns:
+        (width, height)
+    """
+    with Image.open(BytesIO(image_data)) as img:
+        return img.size
+
+
+@IMAGE_RESIZE_SECONDS.time()
+def optimize_image(
+    image_data: bytes,
+    max_width: int = 800,
+    max_height: Optional[int] = 800,
+    quality: int = IMAGE_QUALITY,
+    photo_format: str = IMAGE_PHOTO_FORMAT
+) -> Tuple[bytes, str]:
     """
-    Resize an image to fit within the specified dimensions while maintaining aspect ratio
+    Downscale an image to fit within the given bounds and encode it by content
+    
+    JPEGs are decoded at reduced scale (libjpeg draft mode) when they are
+    much larger than the bounds, so the full-resolution bitmap is never built.
+    The image is rotated upright from its EXIF orientation and EXIF is
+    dropped. Photos are encoded as JPEG or WebP at the quality target;
+    images with transparency or few colours (logos, icons) are encoded as PNG.
     
     Args:
         image_data: Raw image bytes
         max_width: Maximum width
-        max_height: Maximum height
+        max_height: Maximum height, or None for no limit
+        quality: Quality target for photos
+        photo_format: "JPEG" or "WEBP"
         
     Returns:
-        Resized image bytes
+        (image bytes, MIME type)
     """
     img = Image.open(BytesIO(image_data))
-    
-    # Calculate new dimensions while preserving aspect ratio
     width, height = img.size
+    if max_height is None:
+        max_height = height
     
-    if width > max_width or height > max_height:
-        ratio = min(max_width / width, max_height / height)
-        new_width = int(width * ratio)
-        new_height = int(height * ratio)
-        img = img.resize((new_width, new_height), Image.LANCZOS)
+    # Bounds apply to the upright image; thumbnail() runs before the rotation
+    orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+    if orientation in _ROTATED_ORIENTATIONS:
+        max_width, max_height = max_height, max_width
     
-    # Convert back to bytes
+    # thumbnail() picks the JPEG draft scale, then finishes with LANCZOS
+    img.thumbnail((max_width, max_height), Image.LANCZOS)
+    img = ImageOps.exif_transpose(img)
+    img.info.pop("exif", None)
+    return encode_image(img, quality, photo_format)
+
+
+def encode_image(
+    img: Image.Image,
+    quality: int = IMAGE_QUALITY,
+    photo_format: str = IMAGE_PHOTO_FORMAT
+) -> Tuple[bytes, str]:
+    """
+    Encode an image as PNG if it is a graphic, otherwise as a photo
+    
+    Args:
+        img: Decoded image
+        quality: Quality target for photos
+        photo_format: "JPEG" or "WEBP"
+        
+    Returns:
+        (image bytes, MIME type)
+    """
     buffered = BytesIO()
-    img.save(buffered, format="PNG")
+    has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    if img.mode not in ("1", "L", "P", "RGB", "RGBA", "LA"):
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    
+    colors = img.getcolors(GRAPHIC_MAX_GREY_LEVELS if img.mode == "L" else GRAPHIC_MAX_COLORS)
+    if colors is not None and len(colors) > GRAPHIC_MAX_GREY_LEVELS and _is_grey(colors):
+        # A greyscale photo stored as RGB
+        colors = None
+    if has_alpha or colors is not None:
+        if colors is not None and img.mode in ("RGB", "RGBA"):
+            # Few colours: a palette keeps every pixel and shrinks the PNG
+            img = img.quantize(colors=len(colors))
+        img.save(buffered, format="PNG", optimize=True)
+        return buffered.getvalue(), IMAGE_MIME_TYPES["PNG"]
+    
+    if img.mode not in ("L", "RGB"):
+        img = img.convert("RGB")
+    if photo_format == "WEBP":
+        img.save(buffered, format="WEBP", quality=quality, method=4)
+    else:
+        photo_format = "JPEG"
+        img.save(buffered, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffered.getvalue(), IMAGE_MIME_TYPES[photo_format]
+
+
+def _is_grey(colors) -> bool:
+    # Palette images report indexes rather than colours
+    return all(
+        not isinstance(color, int) and len(color) >= 3 and color[0] == color[1] == color[2]
+        for _, color in colors
+    )
+
+
+def reencode_jpeg(image_data: bytes, quality: int = IMAGE_QUALITY) -> bytes:
+    """
+    Decode an image and re-encode it as JPEG
+    
+    Args:
+        image_data: Raw image bytes
+        quality: JPEG quality
+        
+    Returns:
+        JPEG bytes, upright and without EXIF
+    """
+    img = ImageOps.exif_transpose(Image.open(BytesIO(image_data)))
+    buffered = BytesIO()
+    img.convert("RGB").save(buffered, format="JPEG", quality=quality, optimize=True, progressive=True)
     return buffered.getvalue()
 
 if __name__ == "__main__":
@@ -104,6 +242,6 @@ if __name__ == "__main__":
     with open("example.jpg", "rb") as f:
         image_data = f.read()
     
-    # Resize the image
-    resized_image = resize_image(image_data, max_width=800, max_height=600)
-    print(f"Original size: {len(image_data)} bytes, Resized size: {len(resized_image)} bytes")
\ No newline at end of file
+    # Optimize the image for its content
+    optimized_image, mime_type = optimize_image(image_data, max_width=800, max_height=600)
+    print(f"Original size: {len(image_data)} bytes, Optimized size: {len(optimized_image)} bytes ({mime_type})")
\ No newline at end of file
@@ -1,7 +1,9 @@
 import re
 from typing import Dict
+from app.utils.metrics import HTML_PROCESSING_SECONDS
 
 # app/utils/markdown_helpers.py的新函数实现
+@HTML_PROCESSING_SECONDS.labels(step="extract_html").time()
 def extract_html_from_markdown(text):
     """
     从markdown文本中提取HTML内容。
@@ -20,10 +22,113 @@ def extract_html_from_markdown(text):
     if matches:
         # 返回找到的第一个HTML块
         return matches[0]
-    else:
-        # 未找到markdown HTML块，返回原始文本
-        return text
+    
+    # 输出在结束标记之前被截断（如读到</html>即停止）时，只去掉开始标记
+    unterminated = re.search(r"```html\s+(.*)$", text, re.DOTALL)
+    if unterminated:
+        return unterminated.group(1).rstrip()
+    
+    # 未找到markdown HTML块，返回原始文本
+    return text
+
+
+def find_html_end(text):
+    """
+    判断模型输出的HTML是否已经完整，用于提前停止读取流式输出。
+    以</html>或HTML代码块的结束标记作为结尾。
+    
+    Args:
+        text: 目前为止收到的模型输出
+        
+    Returns:
+        HTML结束位置（之后的内容可以丢弃），尚未结束时返回None
+    """
+    html_end = text.find("</html>")
+    if html_end != -1:
+        return html_end + len("</html>")
+    
+    fence_start = text.find("```")
+    if fence_start != -1:
+        body_start = text.find("\n", fence_start)
+        if body_start != -1:
+            fence_end = text.find("```", body_start)
+            if fence_end != -1:
+                return fence_end + 3
+    return None
+
+class HtmlStreamExtractor:
+    """
+    流式版本的 extract_html_from_markdown。
+    逐块输入模型输出，去掉开头的 ```html 代码块标记和结尾的 ``` 标记，
+    只返回可以立即显示的HTML片段。
+    """
+    
+    FENCE = "```"
+    
+    def __init__(self):
+        self._buffer = ""
+        self._state = "start"  # start -> body -> done
+    
+    def feed(self, text):
+        """
+        输入一段模型输出
+        
+        Args:
+            text: 新到达的文本片段
+            
+        Returns:
+            可以立即输出的HTML片段（可能为空字符串）
+        """
+        if self._state == "done" or not text:
+            return ""
+        
+        self._buffer += text
+        
+        if self._state == "start":
+            fence_index = self._buffer.find(self.FENCE)
+            tag_index = self._buffer.find("<")
+            if fence_index != -1 and (tag_index == -1 or fence_index < tag_index):
+                # 跳过代码块标记所在的整行（如 ```html）
+                line_end = self._buffer.find("\n", fence_index)
+                if line_end == -1:
+                    return ""
+                self._buffer = self._buffer[line_end + 1:]
+                self._state = "body"
+            elif tag_index != -1:
+                # 没有代码块标记，直接输出HTML
+                self._buffer = self._buffer[tag_index:]
+                self._state = "body"
+            else:
+                return ""
+        
+        fence_index = self._buffer.find(self.FENCE)
+        if fence_index != -1:
+            # 遇到结束标记，之后的内容全部丢弃
+            output = self._buffer[:fence_index].rstrip()
+            self._buffer = ""
+            self._state = "done"
+            return output
+        
+        # 保留末尾的反引号，它们可能是结束标记的开头
+        keep = len(self._buffer) - len(self._buffer.rstrip("`"))
+        output = self._buffer[:len(self._buffer) - keep]
+        self._buffer = self._buffer[len(self._buffer) - keep:]
+        return output
+    
+    def finish(self):
+        """
+        输入结束，返回剩余的HTML片段
+        
+        Returns:
+            剩余的HTML片段（可能为空字符串）
+        """
+        output = self._buffer if self._state == "body" else ""
+        self._buffer = ""
+        self._state = "done"
+        return output
+
 
+@HTML_PROCESSING_SECONDS.labels(step="extract_placeholders").time()
 def extract_image_placeholders(html_content):
     """
     从HTML内容中提取图片占位符。
@@ -0,0 +1,132 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Latency buckets (seconds) for upstream calls and renders, which range from
+# a few milliseconds (cache hits, small exports) to tens of seconds (LLM calls)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+# Latency buckets (seconds) for in-process text and image processing
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+# Size buckets for uploaded images: bytes read, and decoded pixels (width x height)
+UPLOAD_BYTE_BUCKETS = (16e3, 64e3, 256e3, 1e6, 2e6, 4e6, 8e6, 16e6, 32e6)
+UPLOAD_PIXEL_BUCKETS = (0.25e6, 1e6, 2e6, 4e6, 8e6, 12e6, 24e6, 50e6, 100e6)
+
+GEMINI_LATENCY = Histogram(
+    "gemini_request_seconds",
+    "Latency of Gemini API calls",
+    ["operation"],
+    buckets=SLOW_BUCKETS
+)
+GEMINI_PROMPT_TOKENS = Histogram(
+    "gemini_prompt_tokens",
+    "Prompt tokens per Gemini generation",
+    ["operation"],
+    buckets=TOKEN_BUCKETS
+)
+GEMINI_OUTPUT_TOKENS = Histogram(
+    "gemini_output_tokens",
+    "Output tokens per Gemini generation",
+    ["operation"],
+    buckets=TOKEN_BUCKETS
+)
+GEMINI_STREAM_OUTCOMES_TOTAL = Counter(
+    "gemini_stream_outcomes_total",
+    "How streamed generations ended: early_stop at </html> or the closing fence, "
+    "complete at the end of the stream, continued after truncation",
+    ["outcome"]
+)
+HTML_PROCESSING_SECONDS = Histogram(
+    "html_processing_seconds",
+    "Time spent post-processing generated HTML",
+    ["step"],
+    buckets=FAST_BUCKETS
+)
+UNSPLASH_FETCH_SECONDS = Histogram(
+    "unsplash_fetch_seconds",
+    "Time to search Unsplash and download the chosen image",
+    buckets=SLOW_BUCKETS
+)
+IMAGE_RESIZE_SECONDS = Histogram(
+    "image_resize_seconds",
+    "Time spent in optimize_image (decode, resize, encode); calls inside render workers are not collected",
+    buckets=FAST_BUCKETS
+)
+IMAGE_UPLOAD_BYTES = Histogram(
+    "image_upload_bytes",
+    "Size of accepted image uploads",
+    buckets=UPLOAD_BYTE_BUCKETS
+)
+IMAGE_UPLOAD_PIXELS = Histogram(
+    "image_upload_pixels",
+    "Pixel count (from the header) of accepted image uploads",
+    buckets=UPLOAD_PIXEL_BUCKETS
+)
+IMAGE_UPLOADS_REJECTED_TOTAL = Counter(
+    "image_uploads_rejected_total",
+    "Image uploads refused before decoding",
+    ["reason"]
+)
+IMAGE_TASK_SECONDS = Histogram(
+    "image_task_seconds",
+    "Time spent on image pool tasks (decode, resize, encode), excluding queueing",
+    ["task"],
+    buckets=FAST_BUCKETS
+)
+IMAGE_POOL_WAIT_SECONDS = Histogram(
+    "image_pool_wait_seconds",
+    "Time image tasks wait for a free image pool slot",
+    buckets=FAST_BUCKETS
+)
+EXPORT_RENDER_SECONDS = Histogram(
+    "export_render_seconds",
+    "Time to render a resume export, measured in the API process (includes waiting for a render worker)",
+    ["format"],
+    buckets=SLOW_BUCKETS
+)
+EXPORT_QUEUE_WAIT_SECONDS = Histogram(
+    "export_queue_wait_seconds",
+    "Time export jobs spend queued before a job worker picks them up",
+    buckets=SLOW_BUCKETS
+)
+EXPORT_JOB_RUN_SECONDS = Histogram(
+    "export_job_run_seconds",
+    "Time to run an export job once picked up",
+    ["format"],
+    buckets=SLOW_BUCKETS
+)
+EXPORT_QUEUE_DEPTH = Gauge(
+    "export_queue_depth",
+    "Export jobs waiting in the queue"
+)
+EXPORT_JOBS_TOTAL = Counter(
+    "export_jobs_total",
+    "Export jobs by outcome: done, failed, or rejected because the queue was full",
+    ["outcome"]
+)
+ERRORS_TOTAL = Counter(
+    "errors_total",
+    "Errors by processing stage",
+    ["stage"]
+)
+FALLBACK_PLACEHOLDERS_TOTAL = Counter(
+    "fallback_placeholders_total",
+    "Placeholder images served instead of a real image",
+    ["reason"]
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and outcome",
+    ["cache", "result"]
+)
+CACHE_EVICTIONS_TOTAL = Counter(
+    "cache_evictions_total",
+    "Entries evicted from a cache",
+    ["cache"]
+)
+SINGLEFLIGHT_CALLS_TOTAL = Counter(
+    "singleflight_calls_total",
+    "Calls through a single-flight group, by whether they led or shared an upstream call",
+    ["group", "role"]
+)
@@ -0,0 +1,283 @@
+import base64
+import binascii
+import hashlib
+import math
+import re
+from html.parser import HTMLParser
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+from PIL import ExifTags, Image
+from app.services.image_store import blob_hash, load_blob_url
+from app.utils.html_tree import DATA_URI_PATTERN, VOID_ELEMENTS, office_image_width
+from app.utils.image_helpers import _ROTATED_ORIENTATIONS, optimize_image
+from app.utils.logger import app_logger
+
+# CSS pixels per inch
+CSS_PX_PER_INCH = 96
+
+# Formats whose exporters embed images at office_image_width rather than at their CSS box
+OFFICE_FORMATS = ("docx", "pptx")
+
+# Formats prepare_print_images handles, mapped to the image layout they share;
+# formats with the same layout get the same prepared HTML
+IMAGE_LAYOUTS = {"pdf": "pdf", "docx": "office", "pptx": "office"}
+
+_STYLE_SIZE_PATTERN = re.compile(r"(?:^|;)\s*(width|height)\s*:\s*([^;]+)", re.IGNORECASE)
+_PX_PATTERN = re.compile(r"^([\d.]+)(?:px)?$")
+_STYLE_ATTR_PATTERN = re.compile(r"""(\sstyle\s*=\s*)(["'])(.*?)\2""", re.IGNORECASE | re.DOTALL)
+_TAG_END_PATTERN = re.compile(r"\s*/?>$")
+
+
+class _PrintImage:
+    """One <img> tag: where it sits in the HTML and the box size its own attributes set"""
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        src: str,
+        width: Optional[float],
+        height: Optional[float],
+        known: bool,
+        office_width: int
+    ):
+        self.start = start
+        self.end = end
+        self.src = src
+        # Box size in CSS px from the width/height attributes or inline style; None if not set
+        self.width = width
+        self.height = height
+        # False if the box is set in units we cannot resolve here (%, em, ...)
+        self.known = known
+        # Width in CSS px the DOCX/PPTX exporters give the image
+        self.office_width = office_width
+
+
+class _ImageCollector(HTMLParser):
+    """Find data-URI and image-store <img> tags, their offsets and explicit sizes"""
+
+    def __init__(self, html_content: str):
+        super().__init__(convert_charrefs=False)
+        self.images: List[_PrintImage] = []
+        # Open elements and their classes, for the Office image width
+        self._stack: List[Tuple[str, List[str]]] = []
+        # Offset of each line start, to turn getpos() into string offsets
+        self._line_starts = [0] + [match.end() for match in re.finditer("\n", html_content)]
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "img":
+            self._collect(attributes)
+        elif tag not in VOID_ELEMENTS:
+            self._stack.append((tag, attributes.get("class", "").split()))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "img":
+            self._collect({name: value or "" for name, value in attrs})
+
+    def handle_endtag(self, tag):
+        if all(open_tag != tag for open_tag, _ in self._stack):
+            return
+        while self._stack and self._stack.pop()[0] != tag:
+            pass
+
+    def _collect(self, attributes: Dict[str, str]) -> None:
+        src = attributes.get("src", "")
+        if not src.startswith("data:image/") and blob_hash(src) is None:
+            return
+        line, column = self.getpos()
+        start = self._line_starts[line - 1] + column
+        end = start + len(self.get_starttag_text())
+
+        sizes = {"width": attributes.get("width", ""), "height": attributes.get("height", "")}
+        for name, value in _STYLE_SIZE_PATTERN.findall(attributes.get("style", "")):
+            sizes[name.lower()] = value
+        known = True
+        parsed: Dict[str, Optional[float]] = {}
+        for name, value in sizes.items():
+            value = value.strip().lower()
+            match = _PX_PATTERN.match(value)
+            parsed[name] = float(match.group(1)) if match else None
+            if not match and value not in ("", "auto"):
+                known = False
+        office_width = office_image_width(
+            attributes.get("width", ""), (classes for _, classes in reversed(self._stack))
+        )
+        self.images.append(_PrintImage(start, end, src, parsed["width"], parsed["height"], known, office_width))
+
+
+def _display_size(image_data: bytes) -> Optional[Tuple[int, int]]:
+    # Pixel size once rotated upright, which is the image's intrinsic size in CSS px
+    try:
+        with Image.open(BytesIO(image_data)) as img:
+            width, height = img.size
+            if img.getexif().get(ExifTags.Base.Orientation, 1) in _ROTATED_ORIENTATIONS:
+                width, height = height, width
+            return width, height
+    except Exception:
+        return None
+
+
+def _required_scale(image: _PrintImage, size: Tuple[int, int], dpi: int, output_format: str) -> float:
+    """Fraction of the original pixels this use of an image needs at the target DPI"""
+    if output_format in OFFICE_FORMATS:
+        # Office exporters set the width and keep the aspect ratio
+        return image.office_width / size[0] * dpi / CSS_PX_PER_INCH
+    if not image.known:
+        return 1.0
+    width, height = size
+    box_width, box_height = image.width, image.height
+    if box_width is None and box_height is None:
+        # No size set: the box is the intrinsic size, one image pixel per CSS px
+        box_width, box_height = width, height
+    scales = []
+    if box_width is not None:
+        scales.append(box_width / width)
+    if box_height is not None:
+        scales.append(box_height / height)
+    # A stretched box needs enough pixels along its larger scale
+    return max(scales) * dpi / CSS_PX_PER_INCH
+
+
+def downsample_image(
+    image_data: bytes,
+    target_width: int,
+    target_height: Optional[int] = None,
+    jpeg_quality: int = 85
+) -> Optional[Tuple[bytes, str]]:
+    """
+    Shrink an image to fit a target pixel size and recompress it
+
+    Photos are re-encoded as JPEG; images with transparency or few colours
+    become PNG.
+
+    Args:
+        image_data: Raw image bytes
+        target_width: Width in pixels needed at the print resolution
+        target_height: Height in pixels needed, or None to follow the width
+        jpeg_quality: JPEG quality for photos
+
+    Returns:
+        (image bytes, MIME type), or None if the image cannot be decoded
+    """
+    try:
+        return optimize_image(image_data, target_width, target_height, quality=jpeg_quality, photo_format="JPEG")
+    except Exception:
+        return None
+
+
+def _load_image(src: str) -> Optional[bytes]:
+    # Data URIs carry the image; blob URLs are read from the local image store
+    match = DATA_URI_PATTERN.match(src)
+    if not match:
+        return load_blob_url(src)
+    try:
+        return base64.b64decode(match.group(1))
+    except (binascii.Error, ValueError):
+        return None
+
+
+def _rewrite_tag(tag: str, old_src: str, new_src: str, resolution: Optional[float]) -> str:
+    """Swap an <img> tag's source and declare the new image's resolution if its pixel size changed"""
+    tag = tag.replace(old_src, new_src, 1)
+    if resolution is None:
+        return tag
+    declaration = f"image-resolution: {resolution:.6g}dppx"
+    style = _STYLE_ATTR_PATTERN.search(tag)
+    if style:
+        value = style.group(3).rstrip().rstrip(";")
+        value = f"{value}; {declaration}" if value else declaration
+        return tag[:style.start(3)] + value + tag[style.end(3):]
+    end = _TAG_END_PATTERN.search(tag)
+    return tag[:end.start()] + f' style="{declaration}"' + tag[end.start():]
+
+
+def prepare_print_images(
+    html_content: str,
+    dpi: int = 150,
+    jpeg_quality: int = 85,
+    output_format: str = "pdf"
+) -> str:
+    """
+    Downsample embedded data-URI and image-store images to the size they are printed at
+
+    For PDF each image keeps the pixels its box needs at the target DPI: the
+    width/height set on the <img>, or its intrinsic size when none is set.
+    For DOCX and PPTX it keeps the pixels for the width the Office exporters
+    embed it at (office_image_width). A downsampled image gets a CSS
+    image-resolution so its intrinsic size, and with it the PDF layout and
+    any cropping, stays as before (to within an output pixel of rounding).
+    Identical images are processed once and share one data URI, so the
+    renderer decodes and embeds them once.
+
+    Args:
+        html_content: Resume HTML
+        dpi: Target print resolution
+        jpeg_quality: JPEG quality for recompressed photos
+        output_format: Format the HTML is rendered to next (pdf, docx or pptx)
+
+    Returns:
+        HTML with the image sources replaced
+    """
+    collector = _ImageCollector(html_content)
+    collector.feed(html_content)
+    collector.close()
+    if not collector.images:
+        return html_content
+
+    uses: Dict[str, List[_PrintImage]] = {}
+    for image in collector.images:
+        uses.setdefault(image.src, []).append(image)
+
+    # Source -> (new source, image-resolution to declare or None)
+    replacements: Dict[str, Tuple[str, Optional[float]]] = {}
+    processed: Dict[Tuple[str, int, int], Optional[Tuple[str, Optional[float]]]] = {}
+    saved_bytes = 0
+    for src, images in uses.items():
+        image_data = _load_image(src)
+        size = _display_size(image_data) if image_data is not None else None
+        if size is None:
+            continue
+
+        # The use needing the most pixels decides the target size
+        scale = min(1.0, max(_required_scale(image, size, dpi, output_format) for image in images))
+        target_width = max(1, math.ceil(size[0] * scale))
+        target_height = max(1, math.ceil(size[1] * scale))
+        # Same pixels under a different encoding: reuse the first result
+        identity = (hashlib.sha256(image_data).hexdigest(), target_width, target_height)
+        if identity not in processed:
+            processed[identity] = None
+            result = downsample_image(image_data, target_width, target_height, jpeg_quality)
+            if result is not None and len(result[0]) < len(image_data):
+                new_data, mime_type = result
+                new_size = _display_size(new_data)
+                resolution = new_size[0] / size[0] if new_size and new_size != size else None
+                new_src = f"data:{mime_type};base64,{base64.b64encode(new_data).decode()}"
+                processed[identity] = (new_src, resolution)
+        if processed[identity] is not None:
+            replacements[src] = processed[identity]
+            saved_bytes += (len(src) - len(processed[identity][0])) * len(images)
+
+    # Rewrite from the end so the offsets of earlier tags stay valid
+    for image in reversed(collector.images):
+        if image.src in replacements:
+            new_src, resolution = replacements[image.src]
+            tag = _rewrite_tag(html_content[image.start:image.end], image.src, new_src, resolution)
+            html_content = html_content[:image.start] + tag + html_content[image.end:]
+
+    app_logger.info(f"Prepared {len(uses)} images for print, saved {saved_bytes} bytes of HTML")
+    return html_content
+
+
+if __name__ == "__main__":
+    # Test the print pass with a large photo at two explicit sizes and once at its own size
+    img = Image.new("RGB", (3000, 3000), color=(120, 160, 200))
+    buffered = BytesIO()
+    img.save(buffered, format="PNG")
+    uri = f"data:image/png;base64,{base64.b64encode(buffered.getvalue()).decode()}"
+    html = (f'<div class="profile-photo"><img src="{uri}" width="100"></div>'
+            f'<div class="school-logo"><img src="{uri}" style="width: 50px"></div>'
+            f'<img src="{uri}">')
+    for output_format in ("pdf", "docx"):
+        prepared = prepare_print_images(html, dpi=150, output_format=output_format)
+        print(f"{output_format} HTML size: {len(html)} -> {len(prepared)} bytes")
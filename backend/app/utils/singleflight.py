@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+from app.utils.metrics import SINGLEFLIGHT_CALLS_TOTAL
+
+
+def normalize_key(text: str) -> str:
+    """
+    Normalise free text so trivially different inputs share one flight
+
+    Args:
+        text: Query or prompt text
+
+    Returns:
+        Lower-cased text with runs of whitespace collapsed
+    """
+    return " ".join(text.lower().split())
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one upstream call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task and share its result (or
+    exception). The task is shielded, so a caller that disconnects does not
+    cancel the work for everyone else.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "shared": 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() once per key among concurrent callers
+
+        Args:
+            key: Identity of the call
+            factory: Zero-argument callable returning the awaitable to run
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.stats["calls"] += 1
+            SINGLEFLIGHT_CALLS_TOTAL.labels(self.name, "leader").inc()
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.stats["shared"] += 1
+            SINGLEFLIGHT_CALLS_TOTAL.labels(self.name, "shared").inc()
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+
+if __name__ == "__main__":
+    # Test the single-flight group
+    async def main():
+        flight = SingleFlight("test")
+
+        async def slow_call():
+            await asyncio.sleep(0.1)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", slow_call) for _ in range(5)))
+        print(results, flight.stats)
+
+    asyncio.run(main())
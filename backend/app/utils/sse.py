@@ -0,0 +1,17 @@
+import json
+from typing import Any
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """
+    Format a single Server-Sent Events message
+
+    Args:
+        event: Event name
+        data: JSON-serialisable payload
+
+    Returns:
+        The encoded event, terminated by a blank line
+    """
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
@@ -1,12 +1,5 @@
-# 更新后的单列式 HTML+CSS 简历模板
-DEFAULT_RESUME_HTML = """
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>个人简历</title>
-    <style>
+# 简历模板的样式表（服务端在生成结果中统一注入，无需让模型复述）
+DEFAULT_RESUME_STYLE = """
         /* A4 页面设置 */
         body {
             width: 210mm;
@@ -160,9 +153,10 @@ DEFAULT_RESUME_HTML = """
         li {
             margin-bottom: 5px;
         }
-    </style>
-</head>
-<body>
+    """
+
+# 简历模板的<body>内容
+DEFAULT_RESUME_BODY = """
     <div class="resume-header">
         <div class="profile-photo">
             <!-- 头像占位符 -->
@@ -252,10 +246,31 @@ DEFAULT_RESUME_HTML = """
             <li>{兴趣3}</li>
         </ul>
     </div>
-</body>
+"""
+
+# 包裹<body>内容的文档外壳（含完整样式表）
+RESUME_DOCUMENT_PREFIX = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>个人简历</title>
+    <style>""" + DEFAULT_RESUME_STYLE + """</style>
+</head>
+<body>"""
+RESUME_DOCUMENT_SUFFIX = """</body>
 </html>
 """
 
+# 更新后的单列式 HTML+CSS 简历模板
+DEFAULT_RESUME_HTML = RESUME_DOCUMENT_PREFIX + DEFAULT_RESUME_BODY + RESUME_DOCUMENT_SUFFIX
+
+# 精简提示词使用的模板骨架：只有<body>结构和class名称，去掉缩进
+DEFAULT_RESUME_SKELETON = "\n".join(
+    line.strip() for line in DEFAULT_RESUME_BODY.splitlines() if line.strip()
+)
+
 
 GENERATE_PROMPT_TEMPLATE = """
 <背景>
@@ -311,4 +326,97 @@ GENERATE_PROMPT_TEMPLATE = """
 
 {default_html_template}
 </输出格式>
-"""
\ No newline at end of file
+"""
+
+COMPACT_GENERATE_PROMPT_TEMPLATE = """
+<背景>
+您是一位专业简历撰写AI助手，精通创建专业、简洁且格式规范的简历。您专门为中国求职市场服务，了解中国雇主的喜好和期望。
+在中国求职市场，简历中应避免出现工作或学习的空窗期（gap year），如有空窗期应适当填充或合理解释。
+</背景>
+
+<角色>
+简历撰写专家
+</角色>
+
+<任务>
+根据用户提供的信息，使用HTML创建一份专业简历，适合在A4纸上打印。
+</任务>
+
+<风格>
+- 专业简洁
+- 结构清晰（个人信息、概述、工作经验、教育背景、技能等）
+- 整洁的排版，适当使用标题、项目符号和间距
+- 图片占位符使用特殊语法标记：<img src="image:placeholder_id" alt="描述">
+</风格>
+
+<指标>
+- 长度：内容应适合单页A4纸张
+- 只关注相关信息
+- 使用专业语言和行业适用的术语
+- 避免出现空窗期，确保时间线连贯
+</指标>
+
+<用户输入>
+姓名: {name}
+职位: {position}
+{additional_info}
+</用户输入>
+
+<输出格式>
+使用HTML创建简历。使用单列布局，按照以下顺序排列主要部分：
+1. 个人信息（顶部）
+2. 教育经历
+3. 工作经历
+4. 项目经历
+5. 专业技能
+
+可选部分(用户未提供时可忽略)：
+6. 语言能力
+7. 证书与资质
+8. 兴趣爱好
+
+对于任何图片（个人照片、图标等），请使用占位符语法：<img src="image:placeholder_id" alt="描述">，
+其中placeholder_id是唯一标识符。
+
+样式表由系统统一提供。只输出<body>标签内部的HTML，用```html代码块包裹；
+不要输出<html>、<head>、<body>或<style>标签，也不要使用内联样式。
+请沿用以下模板骨架中的结构和class名称：
+
+{default_html_template}
+</输出格式>
+"""
+
+
+SECTION_UPDATE_PROMPT_TEMPLATE = """
+<背景>
+您是一位专业简历撰写AI助手，精通更新专业简历。您专门为中国求职市场服务，了解中国雇主的喜好和期望。
+在中国求职市场，简历中应避免出现工作或学习的空窗期（gap year），如有空窗期应适当填充或合理解释。
+</背景>
+
+<角色>
+简历撰写专家
+</角色>
+
+<任务>
+以下是一份HTML简历中的「{section_title}」部分。请根据用户输入更新这一部分的内容，保持原有的HTML结构和class名称不变。
+</任务>
+
+<用户输入>
+姓名: {name}
+职位: {position}
+{additional_info}
+</用户输入>
+
+<现有部分>
+{section_html}
+</现有部分>
+
+<更新要求>
+{update_instructions}
+</更新要求>
+
+<输出格式>
+只输出更新后的「{section_title}」部分的HTML片段，用```html代码块包裹。
+不要输出其他部分，也不要输出<html>、<head>、<body>或<style>标签。保留现有图片占位符。
+</输出格式>
+"""
@@ -5,6 +5,7 @@ import ResumeEditor from './components/ResumeEditor';
 import ResumePreview from './components/ResumePreview';
 import ImagePlaceholderManager from './components/ImagePlaceholderManager';
 import ExportOptions from './components/ExportOptions';
+import { imageApi } from './services/api';
 
 function App() {
   const [resumeData, setResumeData] = useState(null);
@@ -13,6 +14,8 @@ function App() {
   const [imageData, setImageData] = useState({});
   const [selectedPlaceholder, setSelectedPlaceholder] = useState(null);
   const [viewMode, setViewMode] = useState('preview'); // 'code' or 'preview'
+  const [isResolving, setIsResolving] = useState(false);
+  const [resolveError, setResolveError] = useState(null);
 
   const handleGenerateResume = (data) => {
     setResumeData(data);
@@ -31,6 +34,32 @@ function App() {
     });
   };
 
+  const handleResolveAll = async () => {
+    // Search for every placeholder that has no image yet, in one streamed request
+    const pending = Object.fromEntries(
+      Object.entries(imagePlaceholders).filter(([id]) => !imageData[id])
+    );
+    if (Object.keys(pending).length === 0) return;
+
+    setIsResolving(true);
+    setResolveError(null);
+    try {
+      await imageApi.resolveImagesBatch(pending, {}, (result) => {
+        if (result.image_data) {
+          setImageData((current) => ({
+            ...current,
+            [result.placeholder_id]: result.image_data
+          }));
+        }
+      });
+    } catch (err) {
+      setResolveError(err.message || 'Failed to resolve images');
+      console.error('Error resolving images:', err);
+    } finally {
+      setIsResolving(false);
+    }
+  };
+
   const handleSelectPlaceholder = (placeholderId) => {
     setSelectedPlaceholder(placeholderId);
   };
@@ -84,6 +113,12 @@ function App() {
           <div className="bottom-controls">
             <div className="placeholders-section">
               <h3>Image Placeholders</h3>
+              {Object.keys(imagePlaceholders).length > 0 && (
+                <button onClick={handleResolveAll} disabled={isResolving}>
+                  {isResolving ? 'Finding images...' : 'Find images for all'}
+                </button>
+              )}
+              {resolveError && <div className="error-message">{resolveError}</div>}
               <div className="placeholders-list">
                 {Object.entries(imagePlaceholders).map(([id, description]) => (
                   <div 
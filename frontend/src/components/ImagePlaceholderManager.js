@@ -51,8 +51,25 @@ const ImagePlaceholderManager = ({ placeholderId, description, onUpdateImage })
     }
   };
 
-  const handleSelectSearchResult = (imageData) => {
-    onUpdateImage(placeholderId, imageData);
+  const handleSelectSearchResult = async (result) => {
+    // Results carry thumbnails; fetch the full-size image for the one picked
+    if (!result.full_image_url) {
+      onUpdateImage(placeholderId, result.image_data);
+      return;
+    }
+    
+    setIsSearching(true);
+    setError(null);
+    
+    try {
+      const response = await imageApi.selectImage(result.full_image_url, placeholderId);
+      onUpdateImage(placeholderId, response.data.image_data);
+    } catch (err) {
+      console.error('Error fetching full-size image:', err);
+      onUpdateImage(placeholderId, result.image_data);
+    } finally {
+      setIsSearching(false);
+    }
   };
 
   const handleGenerate = async () => {
@@ -146,9 +163,9 @@ const ImagePlaceholderManager = ({ placeholderId, description, onUpdateImage })
                 <div 
                   key={index} 
                   className="search-result"
-                  onClick={() => handleSelectSearchResult(result.image_data)}
+                  onClick={() => handleSelectSearchResult(result)}
                 >
-                  <img src={result.image_data} alt={`Search result ${index + 1}`} />
+                  <img src={result.image_data} alt={result.description || `Search result ${index + 1}`} />
                 </div>
               ))}
               
@@ -6,6 +6,17 @@ const api = axios.create({
   timeout: 60000, // 60 seconds timeout for long operations like image generation
 });
 
+// Blob URLs come back root-relative; resolve them against the API's origin
+const withImageUrl = (result) => {
+  if (!result.image_data?.startsWith('/')) return result;
+  const apiBase = new URL(api.defaults.baseURL, window.location.origin);
+  return { ...result, image_data: new URL(result.image_data, apiBase).href };
+};
+const withImageUrls = (response) => ({
+  ...response,
+  data: Array.isArray(response.data) ? response.data.map(withImageUrl) : withImageUrl(response.data),
+});
+
 // Resume API endpoints
 export const resumeApi = {
   generateResume: (data) => api.post('/resume/generate', data),
@@ -18,17 +29,55 @@ export const imageApi = {
     const formData = new FormData();
     formData.append('file', file);
     formData.append('placeholder_id', placeholderId);
+    // Ask for a blob URL so the resume HTML references the image instead of embedding it
+    formData.append('as_url', 'true');
     
     return api.post('/image/upload', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
-    });
+    }).then(withImageUrls);
   },
-  searchImages: (query, placeholderId) => 
-    api.post('/image/search', { query, placeholder_id: placeholderId }),
+  searchImages: (query, placeholderId, count = 6) => 
+    api.post('/image/search', { query, placeholder_id: placeholderId, count, as_url: true }).then(withImageUrls),
+  selectImage: (imageUrl, placeholderId) =>
+    api.post('/image/select', { image_url: imageUrl, placeholder_id: placeholderId, as_url: true }).then(withImageUrls),
   generateImage: (prompt, placeholderId) => 
-    api.post('/image/generate', { prompt, placeholder_id: placeholderId }),
+    api.post('/image/generate', { prompt, placeholder_id: placeholderId, as_url: true }).then(withImageUrls),
+  // Resolve many placeholders in one request; onResult is called for each image as it arrives
+  resolveImagesBatch: async (placeholders, strategies, onResult) => {
+    const response = await fetch(`${api.defaults.baseURL}/image/resolve-batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ placeholders, strategies, as_url: true }),
+    });
+    if (!response.ok) {
+      throw new Error(`Failed to resolve images (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      // Server-Sent Events are separated by a blank line
+      const events = buffer.split('\n\n');
+      buffer = events.pop();
+      for (const raw of events) {
+        const event = raw.match(/^event: (.*)$/m)?.[1];
+        const data = raw.match(/^data: (.*)$/m)?.[1];
+        if (!event || !data) continue;
+        const payload = JSON.parse(data);
+        if (event === 'image') {
+          onResult(withImageUrl(payload));
+        } else if (event === 'error') {
+          throw new Error(payload.detail);
+        }
+      }
+    }
+  },
 };
 
 // Export API endpoints
@@ -38,6 +87,16 @@ export const exportApi = {
       { html_content: html, format, filename },
       { responseType: 'blob' }
     ),
+  submitExportJob: (html, format, filename = 'resume') =>
+    api.post('/export/jobs', { html_content: html, format, filename }),
+  getExportJob: (jobId) => api.get(`/export/jobs/${jobId}`),
+  downloadExportJob: (jobId) =>
+    api.get(`/export/jobs/${jobId}/download`, { responseType: 'blob' }),
+  exportBundle: (html, formats, filename = 'resume') =>
+    api.post('/export/bundle',
+      { html_content: html, formats, filename },
+      { responseType: 'blob' }
+    ),
 };
 
 const apiService = {
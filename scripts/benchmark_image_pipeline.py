@@ -0,0 +1,107 @@
+"""
+benchmark_image_pipeline.py - Compare optimize_image with the PNG-only resize it replaced
+
+Usage: python scripts/benchmark_image_pipeline.py [iterations] [image ...]
+
+Without image paths, synthetic samples are used: a 12 MP JPEG photo, a 2 MP
+PNG photo and a flat-colour PNG logo.
+"""
+
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+from app.utils.image_helpers import optimize_image  # noqa: E402
+
+# Upload bounds used by process_uploaded_image
+MAX_SIZE = 500
+
+
+def legacy_resize(image_data, max_width, max_height):
+    """The former resize_image: LANCZOS on the full decode, always saved as PNG"""
+    img = Image.open(BytesIO(image_data))
+    width, height = img.size
+    if width > max_width or height > max_height:
+        ratio = min(max_width / width, max_height / height)
+        img = img.resize((int(width * ratio), int(height * ratio)), Image.LANCZOS)
+    buffered = BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def time_renders(render, iterations):
+    """Run render() repeatedly and return the last result and each duration in milliseconds"""
+    durations = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = render()
+        durations.append((time.perf_counter() - start) * 1000)
+    return result, durations
+
+
+def report(label, output_bytes, durations):
+    print(f"  {label:<14} {output_bytes:>9} bytes   "
+          f"mean {statistics.mean(durations):7.1f} ms   "
+          f"median {statistics.median(durations):7.1f} ms")
+
+
+def synthetic_photo(width, height, image_format):
+    """A smooth, photo-like image: blurred noise over a gradient"""
+    noise = Image.effect_noise((width // 8, height // 8), 60).resize((width, height), Image.BICUBIC)
+    noise = noise.filter(ImageFilter.GaussianBlur(2))
+    gradient = Image.linear_gradient("L").resize((width, height))
+    img = Image.merge("RGB", (noise, gradient, noise.transpose(Image.FLIP_LEFT_RIGHT)))
+    buffered = BytesIO()
+    img.save(buffered, format=image_format, quality=92)
+    return buffered.getvalue()
+
+
+def synthetic_logo(width, height):
+    """A flat-colour graphic with transparency"""
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((width // 8, height // 8, width * 7 // 8, height * 7 // 8), fill=(20, 80, 160, 255))
+    draw.rectangle((width // 3, height // 3, width * 2 // 3, height * 2 // 3), fill=(240, 240, 240, 255))
+    buffered = BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    paths = sys.argv[2:]
+    if paths:
+        samples = []
+        for path in paths:
+            with open(path, "rb") as f:
+                samples.append((os.path.basename(path), f.read()))
+    else:
+        samples = [
+            ("photo 4000x3000 JPEG", synthetic_photo(4000, 3000, "JPEG")),
+            ("photo 1600x1200 PNG", synthetic_photo(1600, 1200, "PNG")),
+            ("logo 1000x1000 PNG", synthetic_logo(1000, 1000)),
+        ]
+
+    print(f"Fitting each image into {MAX_SIZE}x{MAX_SIZE}, {iterations} runs per pipeline")
+    for name, data in samples:
+        print(f"{name} ({len(data)} bytes)")
+        baseline, baseline_times = time_renders(lambda: legacy_resize(data, MAX_SIZE, MAX_SIZE), iterations)
+        report("legacy png", len(baseline), baseline_times)
+        for photo_format in ("JPEG", "WEBP"):
+            (optimized, mime_type), optimized_times = time_renders(
+                lambda: optimize_image(data, MAX_SIZE, MAX_SIZE, photo_format=photo_format),
+                iterations
+            )
+            report(f"optimize {photo_format.lower()}", len(optimized), optimized_times)
+            print(f"  {'':<14} -> {mime_type}, {len(baseline) / len(optimized):.1f}x smaller, "
+                  f"{statistics.mean(baseline_times) / statistics.mean(optimized_times):.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+benchmark_office_export.py - Compare the native DOCX/PPTX exporters with the pandoc path they replaced
+
+Usage: python scripts/benchmark_office_export.py [iterations]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.office_exporters import html_to_docx, html_to_pptx  # noqa: E402
+from app.utils.templates import DEFAULT_RESUME_HTML  # noqa: E402
+
+
+def time_renders(render, iterations):
+    """Run render() repeatedly and return the duration of each call in milliseconds"""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(label, durations):
+    print(f"{label:<16} mean {statistics.mean(durations):8.1f} ms   "
+          f"median {statistics.median(durations):8.1f} ms   "
+          f"min {min(durations):8.1f} ms")
+
+
+def pandoc_export(output_format):
+    """The previous export path: one pandoc process and a temporary file per export"""
+    import pypandoc
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = os.path.join(temp_dir, f"resume.{output_format}")
+        pypandoc.convert_text(
+            DEFAULT_RESUME_HTML,
+            output_format,
+            format="html",
+            outputfile=temp_path,
+            extra_args=["--standalone"]
+        )
+        with open(temp_path, "rb") as f:
+            return f.read()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"Exporting the default resume template {iterations} times per exporter")
+
+    try:
+        pandoc_export("docx")
+        have_pandoc = True
+    except (ImportError, OSError) as e:
+        print(f"pandoc unavailable, skipping the pandoc path: {e}")
+        have_pandoc = False
+
+    for output_format, native in (("docx", html_to_docx), ("pptx", html_to_pptx)):
+        native_times = time_renders(lambda: native(DEFAULT_RESUME_HTML), iterations)
+        report(f"{output_format} native", native_times)
+        if have_pandoc:
+            pandoc_times = time_renders(lambda: pandoc_export(output_format), iterations)
+            report(f"{output_format} pandoc", pandoc_times)
+            speedup = statistics.mean(pandoc_times) / statistics.mean(native_times)
+            print(f"{output_format} speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+benchmark_pdf_render.py - Compare cold PDF renders with renders through a warm PdfRenderContext
+
+The context shares one FontConfiguration and the CJK fallback sheet across
+renders; the template CSS is parsed on every render in both modes.
+
+Usage: python scripts/benchmark_pdf_render.py [iterations]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from weasyprint import HTML  # noqa: E402
+from app.services.export_service import PdfRenderContext  # noqa: E402
+from app.utils.templates import DEFAULT_RESUME_HTML  # noqa: E402
+
+
+def time_renders(render, iterations):
+    """Run render() repeatedly and return the duration of each call in milliseconds"""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(label, durations):
+    print(f"{label:<28} mean {statistics.mean(durations):8.1f} ms   "
+          f"median {statistics.median(durations):8.1f} ms   "
+          f"min {min(durations):8.1f} ms")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"Rendering the default resume template {iterations} times per mode")
+
+    # What every render used to do: fresh fonts for each document
+    cold = time_renders(lambda: HTML(string=DEFAULT_RESUME_HTML).write_pdf(), iterations)
+
+    build_start = time.perf_counter()
+    context = PdfRenderContext()
+    build_ms = (time.perf_counter() - build_start) * 1000
+    context.write_pdf(DEFAULT_RESUME_HTML)
+    warm = time_renders(lambda: context.write_pdf(DEFAULT_RESUME_HTML), iterations)
+
+    report("cold (per-render setup)", cold)
+    report("warm (shared fonts)", warm)
+    print(f"Context build time: {build_ms:.1f} ms (paid once per worker)")
+    saving = statistics.mean(cold) - statistics.mean(warm)
+    print(f"Saving per render: {saving:.1f} ms ({saving / statistics.mean(cold):.0%})")
+
+
+if __name__ == "__main__":
+    main()
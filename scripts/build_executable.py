@@ -86,6 +86,7 @@ a = Analysis(
         'tzdata',
         'email.mime.text',  # Often required by email modules
         'weasyprint',
+        'app.services.export_service',  # Imported lazily by the render worker processes
         'PIL._tkinter_finder',  # Pillow may need this
     ],
     hookspath=[],
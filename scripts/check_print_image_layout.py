@@ -0,0 +1,82 @@
+"""
+check_print_image_layout.py - Check that prepare_print_images leaves every image box where it was
+
+Renders the default resume template, with large photos in its image slots and
+at a few explicit sizes, before and after the print pass, and compares the
+position and size of every laid-out <img>. Exits non-zero on any difference
+larger than one output pixel at the target DPI.
+
+Usage: python scripts/check_print_image_layout.py [dpi]
+"""
+
+import base64
+import os
+import sys
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from PIL import Image  # noqa: E402
+from weasyprint import HTML  # noqa: E402
+from weasyprint.formatting_structure import boxes  # noqa: E402
+from app.services.export_service import fetch_url  # noqa: E402
+from app.utils.print_images import CSS_PX_PER_INCH, prepare_print_images  # noqa: E402
+from app.utils.templates import DEFAULT_RESUME_HTML  # noqa: E402
+
+
+def data_uri(width, height):
+    buffered = BytesIO()
+    Image.effect_noise((width, height), 40).convert("RGB").save(buffered, format="PNG")
+    return f"data:image/png;base64,{base64.b64encode(buffered.getvalue()).decode()}"
+
+
+def build_html():
+    photo = data_uri(1200, 1600)
+    logo = data_uri(900, 600)
+    html = DEFAULT_RESUME_HTML.replace("image:profile_photo", photo).replace("image:school_logo", logo)
+    extra = (f'<p><img src="{photo}" width="120"> <img src="{logo}" style="height: 40px">'
+             f' <img src="{logo}" width="80" height="80"> <img src="{logo}" style="width: 30%"></p>')
+    return html.replace("</body>", extra + "</body>")
+
+
+def image_boxes(html):
+    """(x, y, width, height) of each laid-out <img>, in CSS px, in document order"""
+    document = HTML(string=html, url_fetcher=fetch_url).render()
+    found = []
+    for page_number, page in enumerate(document.pages):
+        for box in page._page_box.descendants():
+            if isinstance(box, boxes.ReplacedBox) and box.element_tag == "img":
+                found.append((page_number, box.position_x, box.position_y, box.width, box.height))
+    return found
+
+
+def main():
+    dpi = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    tolerance = CSS_PX_PER_INCH / dpi
+    html = build_html()
+    prepared = prepare_print_images(html, dpi=dpi)
+    print(f"HTML size: {len(html)} -> {len(prepared)} bytes")
+
+    before = image_boxes(html)
+    after = image_boxes(prepared)
+    if len(before) != len(after):
+        print(f"FAIL: {len(before)} image boxes before, {len(after)} after")
+        sys.exit(1)
+
+    failures = 0
+    for index, (old, new) in enumerate(zip(before, after)):
+        drift = max(abs(a - b) for a, b in zip(old[1:], new[1:]))
+        status = "ok" if old[0] == new[0] and drift <= tolerance else "FAIL"
+        failures += status == "FAIL"
+        print(f"img {index}: page {old[0] + 1} "
+              f"{old[3]:.2f}x{old[4]:.2f} at ({old[1]:.2f}, {old[2]:.2f}) -> "
+              f"{new[3]:.2f}x{new[4]:.2f} at ({new[1]:.2f}, {new[2]:.2f})  {status}")
+
+    if failures:
+        print(f"FAIL: {failures} image boxes moved or resized by more than {tolerance:.2f}px")
+        sys.exit(1)
+    print(f"All {len(before)} image boxes unchanged (tolerance {tolerance:.2f}px)")
+
+
+if __name__ == "__main__":
+    main()